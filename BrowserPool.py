@@ -0,0 +1,91 @@
+# BrowserPool.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). BrowserPool defined and implemented so pin pages can be scraped by
+#           several Chrome instances at once
+
+import threading
+from selenium.webdriver.support.ui import WebDriverWait
+
+PINTEREST_URL = 'https://www.pinterest.com/'
+
+class BrowserPool:
+    # desc: Gives every worker thread its own browser and WebDriverWait. The
+    #       first thread to ask gets the primary browser, every other thread
+    #       gets a new one that is logged in with the primary browser's
+    #       cookies. A browser is only ever used by the thread it was handed to.
+    #
+    # Parameters:
+    # ---------------
+    # primary : webdriver.Chrome
+    #       The scraper's own browser. Must not be used by anyone else while
+    #       the pool is open.
+    #
+    # createBrowser : callable
+    #       Returns a new browser configured like the primary one
+    #
+    # waitTimeout : float
+    #       Timeout of each browser's WebDriverWait
+    #
+    # ignoredExceptions : tuple
+    #       Exceptions each browser's WebDriverWait ignores while polling
+    def __init__(self, primary, createBrowser, waitTimeout, ignoredExceptions):
+        self.__primary = primary
+        self.__createBrowser = createBrowser
+        self.__waitTimeout = waitTimeout
+        self.__ignoredExceptions = ignoredExceptions
+        self.__cookies = primary.get_cookies()
+        self.__isPrimaryTaken = False
+        self.__browsers = []
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+
+    # desc: Returns (browser, wait) for the calling thread, starting a browser
+    #       on its first call
+    def Get(self):
+        session = getattr(self.__local, 'session', None)
+        if (session is not None):
+            return session
+
+        with self.__lock:
+            isPrimary = not self.__isPrimaryTaken
+            self.__isPrimaryTaken = True
+        if (isPrimary):
+            browser = self.__primary
+        else:
+            browser = self.__createBrowser()
+            with self.__lock:
+                self.__browsers.append(browser)
+            self.__ShareCookies(browser)
+
+        session = (browser, WebDriverWait(browser, self.__waitTimeout,
+                                          ignored_exceptions=self.__ignoredExceptions))
+        self.__local.session = session
+        return session
+
+    # desc: Copies the primary browser's login cookies into browser. Cookies can
+    #       only be set for the domain the browser is on, so it visits
+    #       Pinterest first.
+    def __ShareCookies(self, browser):
+        if (not self.__cookies):
+            return
+        browser.get(PINTEREST_URL)
+        for cookie in self.__cookies:
+            try:
+                browser.add_cookie(cookie)
+            except Exception as exc:
+                print(exc)
+
+    # desc: Quits every browser the pool started. The primary browser is left
+    #       open.
+    def Close(self):
+        with self.__lock:
+            browsers = self.__browsers
+            self.__browsers = []
+        for browser in browsers:
+            try:
+                browser.quit()
+            except Exception as exc:
+                print(exc)
@@ -2,33 +2,288 @@
 # CSVHelper.py
 # Created on 5/30/20
 
+# Revision History:
+#   October 18, 2026:
+#       1). BufferedCSVWriter defined and implemented so the scraper keeps one
+#           CSV writer open for a whole session
+#       2). CSV_HEADER added so the header is written as four columns
+#       3). CreateMasterCSV() streams rows into master.csv instead of loading
+#           every CSV into pandas, and keeps a manifest so reruns only append
+#           rows from directories that changed
+#       4). __GetSubDirectories() and __GetSourceCSVs() use os.scandir() and the
+#           stat results it caches
+#       5). CreateMasterCSV() can parse the changed CSVs on a process pool
+
 # TODO update documentation, add CSV helper methods from PinterestScraper
 
-import os, glob
-import pandas as pd
+import os, csv, time, io, json, itertools, collections
+from concurrent.futures import ProcessPoolExecutor
+
+CSV_HEADER = ['Image filename', 'Search keyword', 'Partial caption', 'URL']
+MANIFEST_VERSION = 1
+CHUNK_ROWS = 1000
+
+class BufferedCSVWriter:
+    # desc: Long-lived CSV writer that buffers rows and writes them in batches.
+    #       A crash loses at most the rows that were not flushed yet.
+    #
+    # Parameters:
+    # ---------------
+    # path : string
+    #       Path of the CSV file rows are appended to
+    #
+    # batchSize : int
+    #       Number of buffered rows that triggers a flush
+    #
+    # flushInterval : float
+    #       Seconds after the last flush after which the next WriteRow()
+    #       flushes, even if the batch isn't full
+    #
+    # fsync : bool
+    #       Whether every flush is fsync'd to disk
+    def __init__(self, path, batchSize=50, flushInterval=5.0, fsync=True):
+        self.__batchSize = batchSize
+        self.__flushInterval = flushInterval
+        self.__fsync = fsync
+        self.__rows = []
+        self.__lastFlush = time.monotonic()
+        self.__file = open(path, 'a', newline='')
+        self.__writer = csv.writer(self.__file)
+
+    # desc: Buffers row and flushes if the batch is full or the flush interval
+    #       has passed
+    #
+    # Parameters:
+    # ---------------
+    # row : list
+    #       The cells of one CSV row
+    def WriteRow(self, row):
+        self.__rows.append(row)
+        if (len(self.__rows) >= self.__batchSize or
+                time.monotonic() - self.__lastFlush >= self.__flushInterval):
+            self.Flush()
+
+    # desc: Writes the buffered rows to disk
+    def Flush(self):
+        if (self.__rows):
+            self.__writer.writerows(self.__rows)
+            self.__file.flush()
+            if (self.__fsync):
+                os.fsync(self.__file.fileno())
+            self.__rows = []
+        self.__lastFlush = time.monotonic()
+
+    # desc: Flushes the buffered rows and closes the file
+    def Close(self):
+        if (not self.__file.closed):
+            self.Flush()
+            self.__file.close()
+
+    def __del__(self):
+        self.Close()
 
-def CreateMasterCSV(root, filename):
-    rootContents = __GetSubDirectories(root)
-    dataList = []
-    for dir in rootContents:
-        data = pd.read_csv(glob.glob(os.path.join(dir, "*.csv"))[0])
-        dataList.append(data)
-    
+# desc: Merges the CSV of every directory in root into one master CSV. Rows are
+#       streamed chunk by chunk so memory use doesn't grow with the number of
+#       directories. A manifest next to the master CSV records how much of
+#       each directory's CSV was merged; on a rerun only rows from directories
+#       that changed since are appended. The master CSV is rebuilt from scratch
+#       if a directory was removed or its CSV was rewritten.
+#
+# Parameters:
+# ---------------
+# root : string
+#       Directory holding one subdirectory per keyword
+#
+# filename : string
+#       Name of the master CSV written to root
+#
+# workers : int
+#       Number of processes used to parse changed CSVs. With 1 the CSVs are
+#       streamed in this process.
+def CreateMasterCSV(root, filename, workers=1):
+    masterPath = root + "/" + filename
+    manifestPath = __GetManifestPath(root, filename)
+    sources = __GetSourceCSVs(root)
+
+    manifest = None
     if (DoesCSVExist(root, filename)):
-        print("removed!")
-        RemoveCSV(root, filename)
+        manifest = __LoadManifest(manifestPath)
+    if (manifest is not None and __NeedsRebuild(manifest, sources)):
+        manifest = None
+
+    if (manifest is None):
+        if (DoesCSVExist(root, filename)):
+            print("removed!")
+            RemoveCSV(root, filename)
+        manifest = {'version': MANIFEST_VERSION, 'rows': 0, 'dirs': {}}
+        masterFile = open(masterPath, 'w', newline='')
+        csv.writer(masterFile).writerow([''] + CSV_HEADER)
+    else:
+        masterFile = open(masterPath, 'a', newline='')
+
+    changed = []
+    for dirName, csvPath, stat in sources:
+        entry = manifest['dirs'].get(dirName)
+        if (entry is not None and entry['size'] == stat.st_size and
+                entry['mtime'] == stat.st_mtime):
+            continue
+        changed.append((dirName, csvPath, stat, entry))
+
+    with masterFile:
+        writer = csv.writer(masterFile)
+        if (workers > 1 and len(changed) > 1):
+            for source, rows, offset in __ReadInParallel(changed, workers):
+                rowCount = __WriteRows(writer, rows, manifest['rows'])
+                __RecordMerge(manifest, source, rowCount, offset)
+        else:
+            for source in changed:
+                entry = source[3]
+                offset = entry['offset'] if entry is not None else 0
+                rowCount, offset = __AppendRows(writer, source[1], offset, manifest['rows'])
+                __RecordMerge(manifest, source, rowCount, offset)
+
+    __SaveManifest(manifestPath, manifest)
+
+# desc: Records in the manifest that rowCount rows of source were merged, up to
+#       byte offset of its CSV
+def __RecordMerge(manifest, source, rowCount, offset):
+    dirName, csvPath, stat, entry = source
+    manifest['rows'] += rowCount
+    manifest['dirs'][dirName] = {
+        'file': csvPath,
+        'size': offset,
+        'mtime': stat.st_mtime,
+        'offset': offset,
+        'rows': rowCount + (entry['rows'] if entry is not None else 0)
+    }
+
+# desc: Yields the rows of the CSV opened as raw, starting at byte offset. The
+#       header is skipped when reading from the start. raw is left at the end
+#       of the file once the generator is exhausted.
+def __IterRows(raw, offset):
+    raw.seek(offset)
+    text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    try:
+        reader = csv.reader(text)
+        if (offset == 0):
+            next(reader, None)
+        for row in reader:
+            yield row
+    finally:
+        text.detach()
+
+# desc: Writes rows to writer chunk by chunk, prefixed with a running index
+#       that starts at index. Returns the number of rows written.
+def __WriteRows(writer, rows, index):
+    rowCount = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, CHUNK_ROWS))
+        if (not chunk):
+            break
+        writer.writerows([index + rowCount + i] + row for i, row in enumerate(chunk))
+        rowCount += len(chunk)
+    return rowCount
+
+# desc: Streams the rows of csvPath starting at byte offset into writer
+#
+# Return values:
+# ----------------
+# (number of rows written, byte offset the next merge should start from)
+def __AppendRows(writer, csvPath, offset, index):
+    with open(csvPath, 'rb') as raw:
+        rowCount = __WriteRows(writer, __IterRows(raw, offset), index)
+        return rowCount, raw.tell()
+
+# desc: Reads the rows of csvPath starting at byte offset. Runs in a worker
+#       process of __ReadInParallel().
+#
+# Return values:
+# ----------------
+# (list of rows, byte offset the next merge should start from)
+def __ReadRows(csvPath, offset):
+    with open(csvPath, 'rb') as raw:
+        rows = list(__IterRows(raw, offset))
+        return rows, raw.tell()
+
+# desc: Parses the CSVs of changed on a process pool and yields
+#       (source, rows, offset) in the order of changed. At most two CSVs per
+#       worker are held in memory at once.
+#
+# Parameters:
+# ---------------
+# changed : list
+#       (directory name, CSV path, os.stat_result, manifest entry) tuples
+#
+# workers : int
+#       Number of worker processes
+def __ReadInParallel(changed, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = collections.deque()
+        for source in changed:
+            entry = source[3]
+            offset = entry['offset'] if entry is not None else 0
+            window.append((source, executor.submit(__ReadRows, source[1], offset)))
+            if (len(window) >= workers * 2):
+                source, future = window.popleft()
+                yield (source,) + future.result()
+        while (window):
+            source, future = window.popleft()
+            yield (source,) + future.result()
+
+# desc: Returns (directory name, CSV path, os.stat_result) for every directory
+#       in root that holds a CSV, sorted by directory name. The stat results
+#       come from the directory scan, so no extra stat call is made per file.
+def __GetSourceCSVs(root):
+    results = []
+    for dir in __GetSubDirectories(root):
+        with os.scandir(dir.path) as it:
+            csvEntries = [elem for elem in it
+                          if elem.name.endswith('.csv') and elem.is_file()]
+        if (not csvEntries):
+            continue
+        csvEntry = min(csvEntries, key=lambda elem: elem.name)
+        results.append((dir.name, csvEntry.path, csvEntry.stat()))
+    return results
+
+# desc: Checks whether rows already in the master CSV are no longer valid
+def __NeedsRebuild(manifest, sources):
+    current = {dirName: (csvPath, stat) for dirName, csvPath, stat in sources}
+    for dirName, entry in manifest['dirs'].items():
+        if (dirName not in current):
+            return True
+        csvPath, stat = current[dirName]
+        if (csvPath != entry['file'] or stat.st_size < entry['offset']):
+            return True
+    return False
+
+def __GetManifestPath(root, filename):
+    return root + "/." + filename + ".manifest.json"
+
+def __LoadManifest(path):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get('version') != MANIFEST_VERSION):
+        return None
+    return manifest
 
-    masterCSV = pd.concat(dataList, axis=0, ignore_index=True)
-    masterCSV.to_csv(root + "/" + filename, index=True)
-    
+def __SaveManifest(path, manifest):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(path + '.tmp', path)
 
+# desc: Returns the DirEntry of every directory in root, sorted by name.
+#       Hidden directories are skipped.
 def __GetSubDirectories(root):
-    rootContents = os.listdir(root + "/.")
     results = []
-    for elem in rootContents:
-        elem = root + '/' + elem
-        if (os.path.isdir(os.path.join(os.path.abspath("."), elem))):
-            results.append(elem)  
+    with os.scandir(root) as it:
+        for elem in it:
+            if (not elem.name.startswith('.') and elem.is_dir()):
+                results.append(elem)
+    results.sort(key=lambda elem: elem.name)
     return results
 
 def DoesCSVExist(root, filename):
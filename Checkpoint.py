@@ -0,0 +1,53 @@
+# Checkpoint.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). Save(), Load() and Remove() defined and implemented so an
+#           interrupted scrape can be resumed
+
+import json, os
+
+CHECKPOINT_VERSION = 1
+
+# desc: Atomically writes the scrape state to path. The state is written to a
+#       temporary file first so a crash never leaves a half-written checkpoint.
+#
+# Parameters:
+# ---------------
+# path : string
+#       Path of the checkpoint file
+#
+# state : dict
+#       JSON serializable scrape state
+def Save(path, state):
+    data = dict(state)
+    data['version'] = CHECKPOINT_VERSION
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmpPath, path)
+
+# desc: Returns the scrape state saved at path, or None if there is no usable
+#       checkpoint
+#
+# Parameters:
+# ---------------
+# path : string
+#       Path of the checkpoint file
+def Load(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (data.get('version') != CHECKPOINT_VERSION):
+        return None
+    return data
+
+# desc: Removes the checkpoint at path if there is one
+def Remove(path):
+    if (os.path.isfile(path)):
+        os.remove(path)
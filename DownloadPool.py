@@ -0,0 +1,106 @@
+# DownloadPool.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). DownloadPool defined and implemented so image downloads run in the
+#           background while the browser moves on to the next pin
+#       2). PeekOldest() defined and implemented
+#       3). Drain() can hold back finished jobs whose record isn't ready yet
+
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING_PER_WORKER = 4      # jobs the pool holds per worker by default
+
+class DownloadPool:
+    # desc: Bounded pool of worker threads. Jobs are handed back in the order
+    #       they were submitted, no matter which one finishes first, so the
+    #       caller can keep file numbering and metadata ordering deterministic.
+    #
+    # Parameters:
+    # ---------------
+    # maxWorkers : int
+    #       Number of downloads allowed to run at the same time.
+    #
+    # maxPending : int, optional
+    #       Number of jobs allowed to wait in the pool before Submit() blocks.
+    #       Defaults to PENDING_PER_WORKER times maxWorkers.
+    def __init__(self, maxWorkers=4, maxPending=None):
+        self.__executor = ThreadPoolExecutor(max_workers=maxWorkers,
+                                             thread_name_prefix='download')
+        self.__pending = collections.deque()
+        if (maxPending is None):
+            maxPending = maxWorkers * PENDING_PER_WORKER
+        self.__maxPending = maxPending
+
+    # desc: Queues fn(*args) on the pool. record is handed back untouched by
+    #       Drain() next to the job's return value. Blocks on the oldest job
+    #       when the pool is full so the caller can't run away from the workers.
+    #       The finished job stays pending until it is drained, so callers must
+    #       Drain() after every Submit() for the pool to stay within
+    #       maxPending.
+    #
+    # Parameters:
+    # ---------------
+    # record : object
+    #       Whatever the caller needs to finish the job once it is done
+    #
+    # fn : callable
+    #       The job to run on a worker thread
+    def Submit(self, record, fn, *args):
+        if (len(self.__pending) >= self.__maxPending):
+            self.__pending[0][1].exception()
+        future = self.__executor.submit(fn, *args)
+        self.__pending.append((record, future))
+
+    # desc: Yields (record, result) for finished jobs in submission order. Stops
+    #       at the first unfinished job unless wait is True, in which case it
+    #       waits for every job. A job that raised yields False as its result.
+    #       If isReady is given, a finished job also counts as unfinished until
+    #       isReady(record) is true, except when the pool is over maxPending.
+    #
+    # Parameters:
+    # ---------------
+    # wait : bool
+    #       Whether to block until every pending job has finished
+    #
+    # isReady : callable, optional
+    #       Called with a job's record to decide whether it can be handed back
+    def Drain(self, wait=False, isReady=None):
+        while (self.__pending):
+            record, future = self.__pending[0]
+            if (not wait and not self.__IsFinished(record, future, isReady)):
+                break
+            self.__pending.popleft()
+            try:
+                result = future.result()
+            except Exception as exc:
+                print(exc)
+                result = False
+            yield record, result
+
+    # desc: Returns whether Drain() may hand the job back without waiting. Once
+    #       the pool is over maxPending the oldest job is handed back as soon as
+    #       it is done, so the caller waits on its record instead of the pool
+    #       growing.
+    def __IsFinished(self, record, future, isReady):
+        if (not future.done()):
+            return False
+        if (isReady is None or len(self.__pending) > self.__maxPending):
+            return True
+        return isReady(record)
+
+    # desc: Returns the record of the oldest job that hasn't been drained yet,
+    #       or None if there is none
+    def PeekOldest(self):
+        if (self.__pending):
+            return self.__pending[0][0]
+        return None
+
+    def GetPendingCount(self):
+        return len(self.__pending)
+
+    # desc: Waits for running jobs and stops the worker threads
+    def Shutdown(self):
+        self.__executor.shutdown(wait=True)
@@ -0,0 +1,333 @@
+# HttpClient.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). GetSession(), Get() and Configure() defined and implemented so every
+#           module shares one pooled, keep-alive requests session
+#       2). Get() paces requests per host through RateLimiter and retries
+#           responses that ask it to slow down once the host may be asked again
+#       3). ByteBudget and Download() defined and implemented so images are
+#           streamed to disk, resumed with Range requests and limited in how
+#           many bytes are in flight at once
+
+import hashlib, re, threading
+import requests, RateLimiter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10      # connections kept alive per host
+DEFAULT_TIMEOUT = (5, 15)   # (connect, read) in seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5       # seconds, doubled after every retry
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_ATTEMPTS = 3       # connections a download may resume over
+UNKNOWN_SIZE = 1024 * 1024  # bytes reserved for responses without a length
+# 429 and 503 are left to Get() so RateLimiter sees them and slows the host down
+RETRY_STATUSES = (500, 502, 504)
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes (?:(\d+)-\d+|\*)/(\d+|\*)')
+
+__lock = threading.Lock()
+__session = None
+__settings = {
+    'pool_size': DEFAULT_POOL_SIZE,
+    'timeout': DEFAULT_TIMEOUT,
+    'retries': DEFAULT_RETRIES,
+    'backoff': DEFAULT_BACKOFF
+}
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    # desc: HTTPAdapter that applies a default timeout to requests that don't
+    #       set one, since requests.Session has no such setting
+    #
+    # Parameters:
+    # ---------------
+    # timeout : float or (float, float)
+    #       Timeout used when the caller doesn't pass one
+    def __init__(self, timeout, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if (kwargs.get('timeout') is None):
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+class ByteBudget:
+    # desc: Caps the number of bytes all downloads have in flight together.
+    #       A download reserves its size before it sends its request and gives
+    #       it back when it is done. A download bigger than the whole budget only
+    #       runs when no other download does.
+    #
+    # Parameters:
+    # ---------------
+    # maxBytes : int
+    #       Bytes allowed in flight at the same time
+    def __init__(self, maxBytes):
+        self.__maxBytes = maxBytes
+        self.__inFlight = 0
+        self.__condition = threading.Condition()
+
+    # desc: Blocks until size bytes fit in the budget and reserves them
+    #
+    # Return values:
+    # ----------------
+    # The number of bytes reserved, to be passed to Release()
+    def Acquire(self, size):
+        size = min(size, self.__maxBytes)
+        with self.__condition:
+            while (self.__inFlight > 0 and self.__inFlight + size > self.__maxBytes):
+                self.__condition.wait()
+            self.__inFlight += size
+        return size
+
+    # desc: Changes a reservation to size bytes once the real size is known.
+    #       A reservation that grows is given back while it waits for size to
+    #       fit, like a new Acquire(), so two downloads that both grow can't
+    #       wait on each other.
+    #
+    # Parameters:
+    # ---------------
+    # reserved : int
+    #       Bytes currently reserved, as returned by Acquire() or Resize()
+    #
+    # size : int
+    #       Bytes to reserve instead
+    #
+    # Return values:
+    # ----------------
+    # The number of bytes reserved, to be passed to Release()
+    def Resize(self, reserved, size):
+        size = min(size, self.__maxBytes)
+        with self.__condition:
+            self.__inFlight -= reserved
+            self.__condition.notify_all()
+            while (size > reserved and self.__inFlight > 0 and self.__inFlight + size > self.__maxBytes):
+                self.__condition.wait()
+            self.__inFlight += size
+        return size
+
+    def Release(self, size):
+        with self.__condition:
+            self.__inFlight -= size
+            self.__condition.notify_all()
+
+# desc: Builds a session from the current settings
+def __CreateSession():
+    retry = Retry(total=__settings['retries'],
+                  backoff_factor=__settings['backoff'],
+                  status_forcelist=RETRY_STATUSES,
+                  allowed_methods=('GET', 'HEAD'),
+                  # Otherwise urllib3 retries 429/503 with a Retry-After
+                  # itself and Get() never sees them
+                  respect_retry_after_header=False,
+                  raise_on_status=False)
+    adapter = TimeoutHTTPAdapter(__settings['timeout'],
+                                 pool_connections=__settings['pool_size'],
+                                 pool_maxsize=__settings['pool_size'],
+                                 max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# desc: Changes the settings of the shared session. Settings left as None are
+#       kept. The session is rebuilt the next time it is used.
+#
+# Parameters:
+# ---------------
+# poolSize : int, optional
+#       Number of connections kept alive per host
+#
+# timeout : float or (float, float), optional
+#       Default (connect, read) timeout in seconds
+#
+# retries : int, optional
+#       Number of retries on connection errors and 429/5xx responses
+#
+# backoff : float, optional
+#       Backoff factor between retries in seconds
+def Configure(poolSize=None, timeout=None, retries=None, backoff=None):
+    global __session
+    with __lock:
+        if (poolSize is not None):
+            __settings['pool_size'] = poolSize
+        if (timeout is not None):
+            __settings['timeout'] = timeout
+        if (retries is not None):
+            __settings['retries'] = retries
+        if (backoff is not None):
+            __settings['backoff'] = backoff
+        if (__session is not None):
+            __session.close()
+            __session = None
+
+def GetPoolSize():
+    return __settings['pool_size']
+
+# desc: Returns the shared session, creating it on first use
+def GetSession():
+    global __session
+    with __lock:
+        if (__session is None):
+            __session = __CreateSession()
+        return __session
+
+# desc: GET request through the shared session. Takes the same keyword
+#       arguments as requests.get(). Waits for the RateLimiter of the url's
+#       host before every attempt. Responses with a status in
+#       RateLimiter.THROTTLE_STATUSES are retried up to the configured number
+#       of retries, after the Retry-After the host sent or an exponential
+#       backoff if it sent none.
+#
+# Parameters:
+# ---------------
+# url : string
+#       The URL we want to request
+def Get(url, **kwargs):
+    limiter = RateLimiter.GetLimiter(url)
+    attempt = 0
+    while True:
+        limiter.Acquire()
+        try:
+            response = GetSession().get(url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            limiter.Release(failed=True)
+            raise
+        except:
+            limiter.Release()
+            raise
+
+        throttled = response.status_code in RateLimiter.THROTTLE_STATUSES
+        retryAfter = RateLimiter.ParseRetryAfter(response.headers.get('Retry-After'))
+        if (throttled and retryAfter is None):
+            retryAfter = __settings['backoff'] * (2 ** attempt)
+        # elapsed is the time until the headers arrived, so large bodies
+        # don't look like a slow host
+        limiter.Release(response.status_code, response.elapsed.total_seconds(), retryAfter)
+
+        if (not throttled or attempt >= __settings['retries']):
+            return response
+        response.close()
+        attempt += 1
+
+
+# desc: Returns the number of bytes a response's body will take in flight
+def GetContentLength(response):
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return UNKNOWN_SIZE
+
+# desc: Streams the image at url into the file at path chunk by chunk, so
+#       memory use doesn't depend on the size of the image. If path already
+#       holds the start of the image, e.g. from an interrupted run, only the
+#       rest is requested with a Range header. A connection that drops
+#       mid-download is resumed the same way, up to DOWNLOAD_ATTEMPTS times.
+#       Hosts that ignore the Range header have the image downloaded again
+#       from the start.
+#
+# Parameters:
+# ---------------
+# url : string
+#       Link to the image
+#
+# path : string
+#       File the image is written to. Only the caller should rename it into
+#       place once the download succeeded.
+#
+# budget : ByteBudget, optional
+#       Budget the download reserves its size from. The reservation is made
+#       before the request is sent, so a download waiting for the budget
+#       doesn't hold a connection, and is resized once the response says how
+#       big the body is.
+#
+# sizeHint : int, optional
+#       Expected size of the body, e.g. from an earlier probe. UNKNOWN_SIZE is
+#       reserved if it isn't given.
+#
+# Return values:
+# ----------------
+# SHA-256 of the whole image as a hex string. Raises requests exceptions if
+# the image can't be downloaded.
+def Download(url, path, budget=None, sizeHint=None):
+    contentHash = hashlib.sha256()
+    offset = __HashFile(path, contentHash)
+    reserved = 0
+    if (budget is not None):
+        reserved = budget.Acquire(sizeHint if sizeHint is not None else UNKNOWN_SIZE)
+    try:
+        attempt = 1
+        while True:
+            headers = {'Range': 'bytes=%d-'%(offset)} if offset > 0 else None
+            response = None
+            try:
+                response = Get(url, headers=headers, stream=True)
+                if (offset > 0):
+                    start, total = __GetContentRange(response)
+                    if (response.status_code == 416 and total == offset):
+                        # The file already holds the whole image
+                        return contentHash.hexdigest()
+                    if (response.status_code != 206 or start != offset):
+                        # Range ignored or not satisfiable, start over
+                        contentHash = hashlib.sha256()
+                        offset = 0
+                        if (response.status_code != 200):
+                            response.close()
+                            continue
+                response.raise_for_status()
+
+                length = response.headers.get('Content-Length', '')
+                expected = offset + int(length) if length.isdigit() else None
+                if (budget is not None):
+                    reserved = budget.Resize(reserved, GetContentLength(response))
+                with open(path, 'ab' if offset > 0 else 'wb') as f:
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        contentHash.update(chunk)
+                        offset += len(chunk)
+
+                if (expected is not None and offset < expected):
+                    raise requests.exceptions.ChunkedEncodingError(
+                        'Connection closed after %d of %d bytes'%(offset, expected))
+                return contentHash.hexdigest()
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout):
+                if (attempt >= DOWNLOAD_ATTEMPTS):
+                    raise
+                attempt += 1
+            finally:
+                if (response is not None):
+                    response.close()
+    finally:
+        if (budget is not None):
+            budget.Release(reserved)
+
+# desc: Feeds the bytes already in the file at path to contentHash
+#
+# Return values:
+# ----------------
+# Size of the file, 0 if it doesn't exist
+def __HashFile(path, contentHash):
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                contentHash.update(chunk)
+            return f.tell()
+    except FileNotFoundError:
+        return 0
+
+# desc: Parses the Content-Range header of a response to a Range request
+#
+# Return values:
+# ----------------
+# (first byte, total size), either None if the header is missing or doesn't
+# say
+def __GetContentRange(response):
+    match = CONTENT_RANGE_PATTERN.match(response.headers.get('Content-Range', ''))
+    if (match is None):
+        return None, None
+    start = int(match.group(1)) if match.group(1) is not None else None
+    total = int(match.group(2)) if match.group(2) != '*' else None
+    return start, total
@@ -2,9 +2,211 @@
 # ImageFilter.py
 # Created on May 17, 2020
 
+# Revision History:
+#   October 18, 2026:
+#       1). IsImageGreaterThanBounds() reads only the image header instead of
+#           downloading the whole image
+#       2). ImageProbe, ProbeImage(), ProbeImageBounds() and GetImageSize()
+#           defined and implemented so a kept image can be downloaded from the
+#           bytes the probe already read
+#       3). Images are requested through the shared HttpClient session
+#       4). FingerprintImage() defined and implemented to compute a perceptual
+#           hash for near-duplicate detection
+#       5). ProbeImage() records its duration in Metrics
+#       6). ImageProbe records the Content-Length of the image
+#       7). ProbeImageBounds() tells images that couldn't be read apart from
+#           images smaller than the bounds
+
 from PIL import Image
 from io import BytesIO
-import requests
+import struct
+import time
+import requests, HttpClient, Metrics
+
+PROBE_CHUNK_SIZE = 1024
+PROBE_MAX_BYTES = 64 * 1024
+
+# The perceptual hash compares neighbouring pixels of a PHASH_SIZE + 1 by
+# PHASH_SIZE grayscale thumbnail, giving PHASH_SIZE * PHASH_SIZE bits
+PHASH_SIZE = 8
+
+PROBE_SECONDS = Metrics.Histogram('scraper_image_probe_seconds',
+                                  'Time spent reading image headers', ('outcome',))
+
+# JPEG start-of-frame markers that carry the image dimensions (DHT, JPG and
+# DAC share the 0xC_ range but don't)
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+class ImageProbe:
+    # desc: Holds the header of an image that is still being streamed, so the
+    #       rest of the image can be read from the same response later on
+    #
+    # Parameters:
+    # ---------------
+    # url : string
+    #       Link to the image being probed
+    #
+    # response : requests.Response
+    #       Streamed response the header was read from
+    #
+    # chunks : iterator
+    #       The response's content iterator, positioned right after head
+    #
+    # head : bytes
+    #       The bytes read so far
+    def __init__(self, url, response, chunks, head, width, height):
+        self.url = url
+        self.width = width
+        self.height = height
+        self.contentLength = HttpClient.GetContentLength(response)
+        self.__response = response
+        self.__chunks = chunks
+        self.__head = head
+
+    # desc: Yields the whole image, starting with the bytes the probe already
+    #       read. Can only be called once.
+    def IterContent(self):
+        yield self.__head
+        for chunk in self.__chunks:
+            yield chunk
+
+    # desc: Releases the connection held by the probe
+    def Close(self):
+        self.__response.close()
+
+# desc: Reads the width and height from the header of a JPEG, PNG, WebP or GIF
+#       image
+#
+# Parameters:
+# ----------------
+# data : bytes
+#       The first bytes of the image
+#
+# Return values:
+# ----------------
+# (width, height) if the header was found in data, None otherwise
+def GetImageSize(data):
+    if (data[:8] == b'\x89PNG\r\n\x1a\n'):
+        if (len(data) >= 24 and data[12:16] == b'IHDR'):
+            return struct.unpack('>II', data[16:24])
+    elif (data[:6] in (b'GIF87a', b'GIF89a')):
+        if (len(data) >= 10):
+            return struct.unpack('<HH', data[6:10])
+    elif (data[:4] == b'RIFF' and data[8:12] == b'WEBP'):
+        return __GetWebPSize(data)
+    elif (data[:2] == b'\xff\xd8'):
+        return __GetJPEGSize(data)
+    return None
+
+def __GetWebPSize(data):
+    chunk = data[12:16]
+    if (chunk == b'VP8 ' and len(data) >= 30):
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if (chunk == b'VP8L' and len(data) >= 25):
+        b0, b1, b2, b3 = data[21:25]
+        width = 1 + (b0 | (b1 & 0x3f) << 8)
+        height = 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0f) << 10)
+        return width, height
+    if (chunk == b'VP8X' and len(data) >= 30):
+        width = 1 + int.from_bytes(data[24:27], 'little')
+        height = 1 + int.from_bytes(data[27:30], 'little')
+        return width, height
+    return None
+
+def __GetJPEGSize(data):
+    offset = 2
+    while (offset + 4 <= len(data)):
+        if (data[offset] != 0xFF):
+            return None
+        marker = data[offset + 1]
+        if (marker == 0xFF):
+            # Fill byte
+            offset += 1
+            continue
+        if (marker == 0x01 or 0xD0 <= marker <= 0xD9):
+            # Standalone marker, no length field
+            offset += 2
+            continue
+        if (marker in JPEG_SOF_MARKERS):
+            if (offset + 9 > len(data)):
+                return None
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        offset += 2 + length
+    return None
+
+# desc: Streams the image at url until its header has been read
+#
+# Parameters:
+# ----------------
+# url : string
+#       Link to the image we want to probe
+#
+# Return values:
+# ----------------
+# An open ImageProbe, or None if the image could not be read. The caller must
+# Close() the probe or read it to the end with IterContent().
+def ProbeImage(url):
+    start = time.perf_counter()
+    imageRequest = HttpClient.Get(url, stream=True)
+    try:
+        imageRequest.raise_for_status()
+        chunks = imageRequest.iter_content(PROBE_CHUNK_SIZE)
+        head = b''
+        size = None
+        for chunk in chunks:
+            head += chunk
+            size = GetImageSize(head)
+            if (size is not None or len(head) >= PROBE_MAX_BYTES):
+                break
+
+        if (size is None):
+            # Header is unusually large or in a format we don't parse, fall
+            # back to reading the whole image
+            head += b''.join(chunks)
+            size = Image.open(BytesIO(head)).size
+        PROBE_SECONDS.Observe(time.perf_counter() - start, 'ok')
+        return ImageProbe(url, imageRequest, chunks, head, size[0], size[1])
+    except Exception as exc:
+        imageRequest.close()
+        print(exc)
+    PROBE_SECONDS.Observe(time.perf_counter() - start, 'error')
+    return None
+
+# desc: Probes url and keeps the probe open if the image is bigger than the
+#       bounds, so the image can be downloaded without requesting it again
+#
+# Parameters:
+# ----------------
+# url : string
+#       Link to the image we want to check the bounds
+#
+# hMin : int
+#       The lower horizontal bound
+#
+# vMin : int
+#       The lower vertical bound
+#
+# Return values:
+# ----------------
+# (probe, failed): probe is an open ImageProbe if the image is greater than
+# the bounds and None otherwise. failed is True if the image couldn't be read
+# at all (e.g. an HTTP error or a timeout), so its size is unknown.
+def ProbeImageBounds(url, hMin, vMin):
+    if (len(url) == 0):
+        return None, True
+    try:
+        probe = ProbeImage(url)
+    except requests.exceptions.MissingSchema as exc:
+        probe = None
+    if (probe is None):
+        return None, True
+    if (probe.width > hMin and probe.height > vMin):
+        return probe, False
+    probe.Close()
+    return None, False
 
 # desc: Goes to url and checks the image size
 # pre : The url must be a link to a picture. Not a link to a website with the 
@@ -27,17 +229,39 @@ import requests
 # True: if image size is greater than the bounds specified by the user
 # False: if the image size is less than the bounds specified by the user
 def IsImageGreaterThanBounds(url, hMin, vMin):
-    if (len(url) != 0):
-        imageRequest = requests.get(url)
-        try:
-            imageRequest.raise_for_status
-            image = Image.open(BytesIO(imageRequest.content))
-            imageWidth, imageHeight = image.size
-            if (imageWidth > hMin and imageHeight > vMin):
-                return True
-        except requests.exceptions.MissingSchema as exc:
-            pass
-        except Exception as exc:
-            print(exc)
-    
-    return False
\ No newline at end of file
+    probe, failed = ProbeImageBounds(url, hMin, vMin)
+    if (probe is not None):
+        probe.Close()
+        return True
+    return False
+
+# desc: Computes a difference hash of the image at path. Resized or recompressed
+#       copies of an image hash to the same value or differ in a few bits.
+#
+# Parameters:
+# ----------------
+# path : string
+#       Path of the downloaded image
+#
+# Return values:
+# ----------------
+# (64-bit perceptual hash, width, height), or None if the image can't be decoded
+def FingerprintImage(path):
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            # Lets JPEGs decode at a fraction of their size
+            image.draft('L', (PHASH_SIZE * 4, PHASH_SIZE * 4))
+            thumbnail = image.convert('L').resize((PHASH_SIZE + 1, PHASH_SIZE), Image.BILINEAR)
+            pixels = list(thumbnail.getdata())
+    except Exception as exc:
+        print(exc)
+        return None
+
+    perceptualHash = 0
+    for row in range(PHASH_SIZE):
+        offset = row * (PHASH_SIZE + 1)
+        for col in range(PHASH_SIZE):
+            bit = pixels[offset + col] > pixels[offset + col + 1]
+            perceptualHash = perceptualHash << 1 | bit
+    return perceptualHash, width, height
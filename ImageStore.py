@@ -0,0 +1,209 @@
+# ImageStore.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). ImageStore defined and implemented so an image shared by many pins
+#           is downloaded and kept on disk once
+#       2). LookupURL() can be called from the page workers
+#       3). A download is only swapped for a near-duplicate at least as large
+
+import os, shutil, sqlite3, threading
+
+# A perceptual hash is split into this many bands. Two hashes that differ in
+# fewer bits than there are bands share at least one band, so near-duplicate
+# candidates can be looked up with an index instead of a full scan.
+PHASH_BANDS = 8
+PHASH_BAND_BITS = 64 // PHASH_BANDS
+MAX_DISTANCE = PHASH_BANDS - 1
+
+# desc: Returns the number of bits two perceptual hashes differ in
+def GetDistance(a, b):
+    return bin(a ^ b).count('1')
+
+class ImageStore:
+    # desc: Content-addressed store shared by every keyword directory in root.
+    #       Each image is kept once as <store>/<hash[:2]>/<hash>, where hash is
+    #       its SHA-256, and the per-keyword files are hard links to it. An
+    #       SQLite index remembers which image URL resolved to which hash, so a
+    #       repinned image isn't downloaded again, and the perceptual hash of
+    #       every image, so resized or recompressed copies can be caught too.
+    #       The index is shared by the threads using the store behind a lock.
+    #
+    # Parameters:
+    # ---------------
+    # path : string
+    #       Directory of the store. Created if it doesn't exist. Keep it hidden
+    #       (starting with '.') so CSVHelper doesn't treat it as a keyword.
+    #
+    # maxDistance : int, optional
+    #       Number of bits perceptual hashes may differ in for two images to be
+    #       considered the same, at most MAX_DISTANCE. None turns near-duplicate
+    #       detection off and only byte-identical images are shared.
+    def __init__(self, path, maxDistance=None):
+        if (maxDistance is not None and not 0 <= maxDistance <= MAX_DISTANCE):
+            raise ValueError('maxDistance must be between 0 and %d'%(MAX_DISTANCE))
+        self.__path = path
+        self.__maxDistance = maxDistance
+        os.makedirs(path, exist_ok=True)
+
+        bandColumns = ['band%d'%(i) for i in range(PHASH_BANDS)]
+        self.__bandColumns = bandColumns
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path + '/index.sqlite3', check_same_thread=False)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS images ('
+            '    content_hash TEXT PRIMARY KEY,'
+            '    width INTEGER,'
+            '    height INTEGER,' +
+            ''.join('    %s INTEGER,'%(column) for column in bandColumns) +
+            '    has_phash INTEGER NOT NULL'
+            ')')
+        for column in bandColumns:
+            self.__connection.execute(
+                'CREATE INDEX IF NOT EXISTS images_%s ON images (%s)'%(column, column))
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS urls ('
+            '    url TEXT PRIMARY KEY,'
+            '    content_hash TEXT NOT NULL'
+            ')')
+        self.__connection.commit()
+
+    # desc: Looks up an image URL that was already downloaded into the store
+    #
+    # Parameters:
+    # ---------------
+    # url : string
+    #       Link to the image
+    #
+    # Return values:
+    # ----------------
+    # (content hash, width, height) of the stored image, or None
+    def LookupURL(self, url):
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT images.content_hash, images.width, images.height FROM urls '
+                'JOIN images ON images.content_hash = urls.content_hash '
+                'WHERE urls.url = ? AND images.width IS NOT NULL', (url,)).fetchone()
+        if (row is None or not os.path.isfile(self.GetImagePath(row[0]))):
+            return None
+        return row
+
+    # desc: Moves a finished download into the store. If the store already
+    #       holds the same image, or a near-duplicate of it at least as large,
+    #       the download is dropped and the stored image is used instead. A
+    #       smaller near-duplicate is kept next to the download, so a resized
+    #       copy never stands in for an image that passed the bounds.
+    #
+    # Parameters:
+    # ---------------
+    # tempPath : string
+    #       Path of the downloaded image
+    #
+    # contentHash : string
+    #       SHA-256 of the downloaded image
+    #
+    # url : string
+    #       Link the image was downloaded from
+    #
+    # fingerprint : tuple, optional
+    #       (perceptual hash, width, height) from ImageFilter.FingerprintImage()
+    #
+    # Return values:
+    # ----------------
+    # The content hash of the stored image to link to
+    def Add(self, tempPath, contentHash, url, fingerprint=None):
+        with self.__lock:
+            return self.__Add(tempPath, contentHash, url, fingerprint)
+
+    def __Add(self, tempPath, contentHash, url, fingerprint):
+        if (not self.__HasImage(contentHash) and fingerprint is not None):
+            duplicate = self.__FindNearDuplicate(*fingerprint)
+            if (duplicate is not None):
+                print('Near-duplicate of stored image ' + duplicate)
+                contentHash = duplicate
+
+        imagePath = self.GetImagePath(contentHash)
+        if (os.path.isfile(imagePath)):
+            os.remove(tempPath)
+        else:
+            os.makedirs(os.path.dirname(imagePath), exist_ok=True)
+            os.replace(tempPath, imagePath)
+
+        if (fingerprint is not None):
+            perceptualHash, width, height = fingerprint
+            self.__connection.execute(
+                'INSERT OR IGNORE INTO images VALUES (?, ?, ?, %s, 1)'%(', '.join('?' * PHASH_BANDS)),
+                [contentHash, width, height] + self.__SplitBands(perceptualHash))
+        else:
+            self.__connection.execute(
+                'INSERT OR IGNORE INTO images (content_hash, has_phash) VALUES (?, 0)',
+                (contentHash,))
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO urls VALUES (?, ?)', (url, contentHash))
+        return contentHash
+
+    # desc: Makes path refer to the stored image. A hard link is used where the
+    #       filesystem allows it, otherwise the image is copied.
+    #
+    # Parameters:
+    # ---------------
+    # contentHash : string
+    #       Hash of the stored image
+    #
+    # path : string
+    #       Path of the per-keyword file, e.g. <keyword>_<n>.jpg
+    def Link(self, contentHash, path):
+        imagePath = self.GetImagePath(contentHash)
+        try:
+            os.link(imagePath, path)
+        except OSError:
+            shutil.copyfile(imagePath, path)
+
+    def GetImagePath(self, contentHash):
+        return self.__path + '/' + contentHash[:2] + '/' + contentHash
+
+    def __HasImage(self, contentHash):
+        return os.path.isfile(self.GetImagePath(contentHash))
+
+    # desc: Returns the content hash of the stored image closest to
+    #       perceptualHash within maxDistance bits that is at least width by
+    #       height, or None
+    def __FindNearDuplicate(self, perceptualHash, width, height):
+        if (self.__maxDistance is None):
+            return None
+
+        bands = self.__SplitBands(perceptualHash)
+        rows = self.__connection.execute(
+            'SELECT content_hash, %s FROM images WHERE has_phash AND width >= ? AND height >= ? AND (%s)'%(
+                ', '.join(self.__bandColumns),
+                ' OR '.join('%s = ?'%(column) for column in self.__bandColumns)),
+            [width, height] + bands)
+
+        best = None
+        bestDistance = self.__maxDistance + 1
+        for row in rows:
+            distance = GetDistance(perceptualHash, self.__JoinBands(row[1:]))
+            if (distance < bestDistance):
+                best = row[0]
+                bestDistance = distance
+        return best
+
+    def __SplitBands(self, perceptualHash):
+        mask = (1 << PHASH_BAND_BITS) - 1
+        return [perceptualHash >> (PHASH_BAND_BITS * i) & mask for i in range(PHASH_BANDS)]
+
+    def __JoinBands(self, bands):
+        perceptualHash = 0
+        for i, band in enumerate(bands):
+            perceptualHash |= band << (PHASH_BAND_BITS * i)
+        return perceptualHash
+
+    def Commit(self):
+        with self.__lock:
+            self.__connection.commit()
+
+    def Close(self):
+        with self.__lock:
+            self.__connection.commit()
+            self.__connection.close()
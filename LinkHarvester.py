@@ -0,0 +1,201 @@
+# LinkHarvester.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). HarvestLinks() defined and implemented so the links of a board are
+#           collected inside the page instead of through one WebDriver call
+#           per element
+
+import time
+
+# Board resources whose responses list the board's pins. Other resources on
+# the page (e.g. "More ideas") also return pins, which are not part of the
+# board.
+FEED_RESOURCES = ['BoardFeedResource', 'BoardSectionPinsResource']
+
+POLL_INTERVAL = 0.25
+MIN_SETTLE_TIME = 1.0
+MAX_IDLE_TIME = 10.0
+
+# Installed once per page. Collects pin links into window.__pinHarvest from
+# three places: the anchors already on the page, the anchors the grid adds
+# while scrolling (the grid drops anchors that scroll out of view, so polling
+# the DOM misses pins) and the JSON of the board's feed requests.
+INSTALL_SCRIPT = '''
+var feedResources = arguments[0];
+if (window.__pinHarvest) {
+    return;
+}
+
+var harvest = {links: {}, order: [], sent: 0, pending: 0, slowest: 0,
+               height: 0, lastChange: Date.now()};
+window.__pinHarvest = harvest;
+var pattern = /\\/pin\\/([^\\/?#]+)/;
+
+function add(id, href) {
+    if (!(id in harvest.links)) {
+        harvest.links[id] = href;
+        harvest.order.push(id);
+        harvest.lastChange = Date.now();
+    }
+}
+
+function addAnchor(anchor) {
+    var match = pattern.exec(anchor.href);
+    if (match) {
+        add(match[1], anchor.href);
+    }
+}
+
+function addAnchors(node) {
+    if (!node.querySelectorAll) {
+        return;
+    }
+    if (node.matches("a[href*='/pin/']")) {
+        addAnchor(node);
+    }
+    var anchors = node.querySelectorAll("a[href*='/pin/']");
+    for (var i = 0; i < anchors.length; i++) {
+        addAnchor(anchors[i]);
+    }
+}
+
+function addPins(node, depth) {
+    if (depth > 16 || node === null || typeof node !== 'object') {
+        return;
+    }
+    if (node.type === 'pin' && typeof node.id === 'string') {
+        add(node.id, location.origin + '/pin/' + node.id + '/');
+    }
+    for (var key in node) {
+        addPins(node[key], depth + 1);
+    }
+}
+
+function isFeed(url) {
+    url = String(url);
+    for (var i = 0; i < feedResources.length; i++) {
+        if (url.indexOf('/resource/' + feedResources[i] + '/') !== -1) {
+            return true;
+        }
+    }
+    return false;
+}
+
+function track() {
+    var started = Date.now();
+    harvest.pending++;
+    return function () {
+        harvest.pending--;
+        harvest.slowest = Math.max(harvest.slowest, Date.now() - started);
+        harvest.lastChange = Date.now();
+    };
+}
+
+var open = XMLHttpRequest.prototype.open;
+var send = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.open = function (method, url) {
+    this.__harvestURL = url;
+    return open.apply(this, arguments);
+};
+XMLHttpRequest.prototype.send = function () {
+    var xhr = this;
+    if (isFeed(xhr.__harvestURL)) {
+        var done = track();
+        xhr.addEventListener('loadend', function () {
+            try {
+                addPins(xhr.responseType === 'json' ? xhr.response : JSON.parse(xhr.responseText), 0);
+            } catch (e) {
+            }
+            done();
+        });
+    }
+    return send.apply(this, arguments);
+};
+
+var fetch = window.fetch;
+window.fetch = function (input) {
+    var promise = fetch.apply(this, arguments);
+    var url = typeof input === 'string' ? input : input.url;
+    if (isFeed(url)) {
+        var done = track();
+        promise.then(function (response) {
+            return response.clone().json();
+        }).then(function (data) {
+            addPins(data, 0);
+        }).catch(function () {
+        }).then(done);
+    }
+    return promise;
+};
+
+new MutationObserver(function (records) {
+    for (var i = 0; i < records.length; i++) {
+        records[i].addedNodes.forEach(addAnchors);
+    }
+}).observe(document.body, {childList: true, subtree: true});
+addAnchors(document.body);
+'''
+
+# Run once per poll. Scrolls one screen and returns the links harvested since
+# the last poll along with what HarvestLinks() needs to decide when to stop.
+POLL_SCRIPT = '''
+var harvest = window.__pinHarvest;
+var height = document.documentElement.scrollHeight;
+if (height !== harvest.height) {
+    harvest.height = height;
+    harvest.lastChange = Date.now();
+}
+window.scrollBy(0, window.innerHeight);
+
+var ids = harvest.order.slice(harvest.sent);
+harvest.sent = harvest.order.length;
+return {
+    links: ids.map(function (id) { return harvest.links[id]; }),
+    pending: harvest.pending,
+    slowest: harvest.slowest,
+    idle: Date.now() - harvest.lastChange,
+    atBottom: window.innerHeight + window.scrollY >= height - 2
+};
+'''
+
+# desc: Scrolls the board open in browser to the end and returns the link of
+#       every pin on it. Instead of sleeping a fixed time per scroll, the page
+#       is polled every POLL_INTERVAL seconds and harvesting stops once the
+#       page is scrolled to the bottom, no feed request is in flight and
+#       nothing has changed for twice the slowest feed request seen so far
+#       (at least MIN_SETTLE_TIME). A page that stops changing for
+#       MAX_IDLE_TIME is given up on even if it isn't at the bottom.
+#
+# Parameters:
+# ---------------
+# browser : webdriver.Chrome
+#       Browser that has the board open
+#
+# Return values:
+# ----------------
+# list of pin links, in the order they were found. Ctrl-C stops harvesting
+# and returns the links found so far.
+def HarvestLinks(browser):
+    links = []
+    browser.execute_script(INSTALL_SCRIPT, FEED_RESOURCES)
+
+    try:
+        while True:
+            state = browser.execute_script(POLL_SCRIPT)
+            if (state['links']):
+                links.extend(state['links'])
+                print('links: %d'%len(links))
+
+            idle = state['idle'] / 1000.0
+            settleTime = min(MAX_IDLE_TIME, max(MIN_SETTLE_TIME, 2 * state['slowest'] / 1000.0))
+            if (state['atBottom'] and state['pending'] == 0 and idle >= settleTime):
+                break
+            if (idle >= MAX_IDLE_TIME):
+                print('Board stopped loading, stopping early')
+                break
+            time.sleep(POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    return links
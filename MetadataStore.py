@@ -0,0 +1,150 @@
+# MetadataStore.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). MetadataStore defined and implemented to append image metadata to a
+#           JSON Lines file instead of rewriting metadata.json for every image
+#       2). ReadRecords(), Compact(), ImportLegacyJSON() and ExportLegacyJSON()
+#           defined and implemented
+
+import json, os, time
+
+class MetadataStore:
+    # desc: Append-only JSON Lines file with one metadata record per line.
+    #       Records are buffered and written in batches; a crash loses at most
+    #       the records that were not flushed yet.
+    #
+    # Parameters:
+    # ---------------
+    # path : string
+    #       Path of the .jsonl file. Created if it doesn't exist.
+    #
+    # batchSize : int
+    #       Number of buffered records that triggers a flush.
+    #
+    # flushInterval : float
+    #       Seconds after the last flush after which the next Append() flushes,
+    #       even if the batch isn't full.
+    #
+    # fsync : bool
+    #       Whether every flush is fsync'd to disk.
+    def __init__(self, path, batchSize=20, flushInterval=5.0, fsync=True):
+        self.__path = path
+        self.__batchSize = batchSize
+        self.__flushInterval = flushInterval
+        self.__fsync = fsync
+        self.__buffer = []
+        self.__lastFlush = time.monotonic()
+        self.__file = open(path, 'a', encoding='utf-8')
+
+    # desc: Buffers record and flushes if the batch is full or the flush
+    #       interval has passed
+    #
+    # Parameters:
+    # ---------------
+    # record : dict
+    #       The metadata of one image
+    def Append(self, record):
+        self.__buffer.append(json.dumps(record) + '\n')
+        if (len(self.__buffer) >= self.__batchSize or
+                time.monotonic() - self.__lastFlush >= self.__flushInterval):
+            self.Flush()
+
+    # desc: Writes the buffered records to disk
+    def Flush(self):
+        if (self.__buffer):
+            self.__file.write(''.join(self.__buffer))
+            self.__file.flush()
+            if (self.__fsync):
+                os.fsync(self.__file.fileno())
+            self.__buffer = []
+        self.__lastFlush = time.monotonic()
+
+    # desc: Flushes the buffered records and closes the file
+    def Close(self):
+        if (not self.__file.closed):
+            self.Flush()
+            self.__file.close()
+
+    def __del__(self):
+        self.Close()
+
+# desc: Yields the records stored in a JSON Lines file. A torn last line left
+#       behind by a crash is skipped.
+#
+# Parameters:
+# ---------------
+# path : string
+#       Path of the .jsonl file
+def ReadRecords(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if (not line):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print('Skipping unreadable metadata record in ' + path)
+
+# desc: Rewrites a JSON Lines file without unreadable lines and keeps only the
+#       last record written for each image filename
+#
+# Parameters:
+# ---------------
+# path : string
+#       Path of the .jsonl file
+def Compact(path):
+    records = {}
+    for record in ReadRecords(path):
+        records[record.get('image_filename')] = record
+
+    tmpPath = path + '.tmp'
+    with open(tmpPath, 'w', encoding='utf-8') as f:
+        for record in records.values():
+            f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmpPath, path)
+    return len(records)
+
+# desc: Appends the records of a legacy {"image": [...]} metadata.json file to
+#       a JSON Lines file
+#
+# Parameters:
+# ---------------
+# jsonPath : string
+#       Path of the legacy metadata.json
+#
+# jsonlPath : string
+#       Path of the .jsonl file
+def ImportLegacyJSON(jsonPath, jsonlPath):
+    with open(jsonPath, encoding='utf-8') as f:
+        records = json.load(f).get('image', [])
+
+    store = MetadataStore(jsonlPath, batchSize=len(records) + 1)
+    for record in records:
+        store.Append(record)
+    store.Close()
+    return len(records)
+
+# desc: Writes the records of a JSON Lines file in the legacy
+#       {"image": [...]} layout for consumers of metadata.json
+#
+# Parameters:
+# ---------------
+# jsonlPath : string
+#       Path of the .jsonl file
+#
+# jsonPath : string
+#       Path of the metadata.json to write
+def ExportLegacyJSON(jsonlPath, jsonPath):
+    data = {}
+    data['image'] = list(ReadRecords(jsonlPath))
+
+    tmpPath = jsonPath + '.tmp'
+    with open(tmpPath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmpPath, jsonPath)
+    return len(data['image'])
@@ -0,0 +1,228 @@
+# Metrics.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). Counter, Histogram, Render(), Summary() and Reset() defined and
+#           implemented so every stage of a scrape can be timed and counted
+
+import bisect, threading, time
+
+# Upper bounds in seconds of the histogram buckets, from fast HTTP requests
+# to Selenium page loads that run into their timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+
+__lock = threading.Lock()
+__metrics = {}
+
+# desc: Returns the metric registered under name, registering the one built by
+#       create if there is none, so modules can declare their metrics at import
+#       time without clashing
+def __Register(name, create):
+    with __lock:
+        metric = __metrics.get(name)
+        if (metric is None):
+            metric = create()
+            __metrics[name] = metric
+        return metric
+
+class Timer:
+    # desc: Context manager that observes the seconds spent inside it
+    def __init__(self, histogram, labelValues):
+        self.__histogram = histogram
+        self.__labelValues = labelValues
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.__histogram.Observe(time.perf_counter() - self.__start, *self.__labelValues)
+        return False
+
+class Metric:
+    # desc: Base of Counter and Histogram metrics. Formats label names and
+    #       values the way the Prometheus text format expects them, e.g.
+    #       {stage="probe",outcome="ok"}
+    def FormatLabels(self, labelValues, extra=None):
+        pairs = list(zip(self.labelNames, labelValues))
+        if (extra is not None):
+            pairs.append(extra)
+        if (not pairs):
+            return ''
+        escaped = []
+        for name, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append('%s="%s"'%(name, value))
+        return '{' + ','.join(escaped) + '}'
+
+class CounterMetric(Metric):
+    # desc: Monotonic count of events, one value per combination of labels
+    def __init__(self, name, help, labelNames):
+        self.name = name
+        self.help = help
+        self.labelNames = tuple(labelNames)
+        self.__lock = threading.Lock()
+        self.__values = {}
+
+    # desc: Adds amount to the count for labelValues
+    def Add(self, amount, *labelValues):
+        with self.__lock:
+            self.__values[labelValues] = self.__values.get(labelValues, 0) + amount
+
+    def Inc(self, *labelValues):
+        self.Add(1, *labelValues)
+
+    # desc: Returns {label values: count}
+    def Snapshot(self):
+        with self.__lock:
+            return dict(self.__values)
+
+    def Reset(self):
+        with self.__lock:
+            self.__values = {}
+
+    def Render(self):
+        lines = ['# HELP %s %s'%(self.name, self.help), '# TYPE %s counter'%(self.name)]
+        for labelValues, value in sorted(self.Snapshot().items()):
+            lines.append('%s%s %s'%(self.name, self.FormatLabels(labelValues), repr(float(value))))
+        return lines
+
+class HistogramMetric(Metric):
+    # desc: Distribution of observed values (usually seconds) in cumulative
+    #       buckets, one distribution per combination of labels
+    def __init__(self, name, help, labelNames, buckets):
+        self.name = name
+        self.help = help
+        self.labelNames = tuple(labelNames)
+        self.buckets = tuple(sorted(buckets))
+        self.__lock = threading.Lock()
+        self.__series = {}
+
+    # desc: Records value for labelValues
+    def Observe(self, value, *labelValues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(labelValues)
+            if (series is None):
+                series = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+                self.__series[labelValues] = series
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    # desc: Returns a context manager that observes how long its block took
+    def Time(self, *labelValues):
+        return Timer(self, labelValues)
+
+    # desc: Returns {label values: {'counts', 'sum', 'count'}}, with counts
+    #       per bucket (not cumulative) and the overflow bucket last
+    def Snapshot(self):
+        with self.__lock:
+            return {labelValues: {'counts': list(series['counts']), 'sum': series['sum'],
+                                  'count': series['count']}
+                    for labelValues, series in self.__series.items()}
+
+    # desc: Estimates the q-quantile of a Snapshot() series by interpolating
+    #       inside the bucket it falls in, like Prometheus' histogram_quantile
+    def Quantile(self, series, q):
+        if (series['count'] == 0):
+            return 0.0
+        rank = q * series['count']
+        seen = 0
+        lower = 0.0
+        for i, count in enumerate(series['counts']):
+            if (i == len(self.buckets)):
+                # Overflow bucket, the best we can say is "above the last bound"
+                return self.buckets[-1]
+            upper = self.buckets[i]
+            if (count and seen + count >= rank):
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1]
+
+    def Reset(self):
+        with self.__lock:
+            self.__series = {}
+
+    def Render(self):
+        lines = ['# HELP %s %s'%(self.name, self.help), '# TYPE %s histogram'%(self.name)]
+        for labelValues, series in sorted(self.Snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append('%s_bucket%s %d'%(self.name, self.FormatLabels(labelValues, ('le', le)), cumulative))
+            labels = self.FormatLabels(labelValues)
+            lines.append('%s_sum%s %s'%(self.name, labels, repr(series['sum'])))
+            lines.append('%s_count%s %d'%(self.name, labels, series['count']))
+        return lines
+
+# desc: Returns the counter registered as name, creating it on first use
+#
+# Parameters:
+# ---------------
+# name : string
+#       Prometheus metric name, e.g. scraper_pins_total
+#
+# help : string
+#       One line description shown by /metrics
+#
+# labelNames : tuple, optional
+#       Names of the labels the counter is split by
+def Counter(name, help, labelNames=()):
+    return __Register(name, lambda: CounterMetric(name, help, labelNames))
+
+# desc: Returns the histogram registered as name, creating it on first use
+#
+# Parameters:
+# ---------------
+# name : string
+#       Prometheus metric name, e.g. scraper_page_load_seconds
+#
+# help : string
+#       One line description shown by /metrics
+#
+# labelNames : tuple, optional
+#       Names of the labels the histogram is split by
+#
+# buckets : tuple, optional
+#       Upper bounds of the buckets
+def Histogram(name, help, labelNames=(), buckets=DEFAULT_BUCKETS):
+    return __Register(name, lambda: HistogramMetric(name, help, labelNames, buckets))
+
+def __GetMetrics():
+    with __lock:
+        return [__metrics[name] for name in sorted(__metrics)]
+
+# desc: Returns every metric in the Prometheus text exposition format
+def Render():
+    lines = []
+    for metric in __GetMetrics():
+        lines.extend(metric.Render())
+    return '\n'.join(lines) + '\n'
+
+# desc: Returns a human readable report of every metric that recorded
+#       something: count, total, mean, p50 and p95 for histograms and the value
+#       of every counter
+def Summary():
+    lines = []
+    for metric in __GetMetrics():
+        for labelValues, value in sorted(metric.Snapshot().items()):
+            label = metric.name + metric.FormatLabels(labelValues)
+            if (isinstance(value, dict)):
+                if (value['count'] == 0):
+                    continue
+                lines.append('%-60s n=%-6d total=%8.2fs mean=%7.3fs p50=%7.3fs p95=%7.3fs'%(
+                    label, value['count'], value['sum'], value['sum'] / value['count'],
+                    metric.Quantile(value, 0.5), metric.Quantile(value, 0.95)))
+            else:
+                lines.append('%-60s %d'%(label, value))
+    return '\n'.join(lines)
+
+# desc: Clears the values of every metric, e.g. between two scrapes
+def Reset():
+    for metric in __GetMetrics():
+        metric.Reset()
@@ -0,0 +1,107 @@
+# PinIndex.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). PinIndex defined and implemented to remember which pins were
+#           already scraped into a keyword directory across runs
+#       2). GetPinId() defined and implemented
+
+import json, re, sqlite3, time
+
+PIN_ID_PATTERN = re.compile(r'/pin/([^/?#]+)')
+
+STATUS_DOWNLOADED = 'downloaded'
+STATUS_REJECTED = 'rejected'
+
+# desc: Returns the ID of the pin a link points to, or the link itself if it
+#       doesn't look like a pin link
+#
+# Parameters:
+# ---------------
+# link : string
+#       Link to a pin page, e.g. https://www.pinterest.com/pin/12345/
+def GetPinId(link):
+    match = PIN_ID_PATTERN.search(link)
+    if (match is None):
+        return link
+    return match.group(1)
+
+class PinIndex:
+    # desc: SQLite index of the pins scraped into a keyword directory, keyed by
+    #       pin ID. Holds the image filename, content hash and metadata of every
+    #       downloaded pin, and the bounds of every pin rejected by ImageFilter.
+    #
+    # Parameters:
+    # ---------------
+    # path : string
+    #       Path of the SQLite database. Created if it doesn't exist.
+    def __init__(self, path):
+        self.__connection = sqlite3.connect(path)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS pins ('
+            '    pin_id TEXT PRIMARY KEY,'
+            '    link TEXT NOT NULL,'
+            '    status TEXT NOT NULL,'
+            '    image_filename TEXT,'
+            '    content_hash TEXT,'
+            '    metadata TEXT,'
+            '    scraped_at REAL NOT NULL'
+            ')')
+        self.__connection.commit()
+
+    # desc: Checks whether the pin behind link needs to be visited again
+    #
+    # Parameters:
+    # ---------------
+    # link : string
+    #       Link to the pin page
+    #
+    # hMin, vMin : int
+    #       The current image bounds. A pin rejected under smaller or equal
+    #       bounds would be rejected again, so it is skipped too.
+    def IsScraped(self, link, hMin, vMin):
+        row = self.__connection.execute(
+            'SELECT status, metadata FROM pins WHERE pin_id = ?',
+            (GetPinId(link),)).fetchone()
+        if (row is None):
+            return False
+        if (row[0] == STATUS_DOWNLOADED):
+            return True
+        bounds = json.loads(row[1])
+        return hMin >= bounds['hMin'] and vMin >= bounds['vMin']
+
+    # desc: Records a downloaded pin
+    #
+    # Parameters:
+    # ---------------
+    # link : string
+    #       Link to the pin page
+    #
+    # imageFilename : string
+    #       Name the image was saved as
+    #
+    # contentHash : string
+    #       SHA-256 of the image
+    #
+    # metadata : dict
+    #       Title, source and caption written to the metadata file
+    def AddDownloaded(self, link, imageFilename, contentHash, metadata):
+        self.__Add(link, STATUS_DOWNLOADED, imageFilename, contentHash, metadata)
+
+    # desc: Records a pin whose image was not greater than the bounds
+    def AddRejected(self, link, hMin, vMin):
+        self.__Add(link, STATUS_REJECTED, None, None, {'hMin': hMin, 'vMin': vMin})
+
+    def __Add(self, link, status, imageFilename, contentHash, metadata):
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO pins VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (GetPinId(link), link, status, imageFilename, contentHash,
+             json.dumps(metadata), time.time()))
+
+    def Commit(self):
+        self.__connection.commit()
+
+    def Close(self):
+        self.__connection.commit()
+        self.__connection.close()
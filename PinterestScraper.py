@@ -74,6 +74,52 @@
 #       1). SetRoot() added to interface.
 #       2). Search query in ScrapeLinkset updated to be more precise.
 #       3). SetBounds() added to interface.
+#   October 18, 2026:
+#       1). __init__() fixed so that it logs in when credentials are provided
+#       2). ScrapeLinkset() hands image downloads to a DownloadPool so the
+#           browser can move on to the next pin while images download
+#       3). __CommitDownloads() defined and implemented to name and record
+#           finished downloads in the order their pins were visited
+#       4). SetDownloadWorkers() added to interface.
+#       5). ScrapeLinkset() probes the image header with ImageFilter and
+#           __DownloadImage() reuses the probe instead of requesting the image
+#           a second time
+#       6). __DownloadImage() requests images through the shared HttpClient
+#           session and SetDownloadWorkers() grows its pool to match
+#       7). __WriteToMetadataFile() appends to metadata.jsonl through a
+#           MetadataStore instead of rewriting metadata.json for every image
+#       8). __CheckForCaptionsTxt() imports an existing metadata.json into
+#           metadata.jsonl
+#       9). ExportMetadata() and __GetDownloadPath() defined and implemented
+#       10). __WriteToCSVFile() writes through a CSVHelper.BufferedCSVWriter
+#            owned by ScrapeLinkset() instead of reopening the file per row
+#       11). __CreateNewCSVFile() writes the header as four columns
+#       12). ScrapeLinkset() skips pins recorded in the keyword directory's
+#            PinIndex and numbers new images after the ones already on disk
+#       13). __DownloadImage() returns the SHA-256 of the image
+#       14). GetLinkSet() and ScrapeLinkset() checkpoint the link set and the
+#            progress cursor to disk
+#       15). Resume() defined and implemented
+#       16). Images are kept once in a content-addressed ImageStore shared by
+#            every keyword and hard linked into the keyword directories.
+#            Images already in the store aren't downloaded again.
+#       17). SetDuplicateDistance() defined and implemented
+#       18). ScrapeLinkset() scrapes pin pages on a pool of browsers, one per
+#            worker thread, and merges their results in link order
+#       19). SetScrapeWorkers() defined and implemented
+#       20). GetLinkSet() harvests links with LinkHarvester instead of polling
+#            the DOM, __RemoveDuplicates() removed
+#       21). Missing titles are looked up on a TitleParser.TitleResolver with
+#            an on-disk cache instead of inline on the page worker
+#       22). Every stage of a scrape is timed and counted in Metrics and
+#            ScrapeLinkset() prints a report at the end of the run
+#       23). __DownloadImage() rejects error responses instead of saving them
+#            as images, and __GrowConnectionPool() lets RateLimiter run as
+#            many requests per host as there are connections
+#       24). __DownloadImage() streams requested images to their .part file
+#            with HttpClient.Download(), resumes .part files left by an
+#            interrupted run and shares a ByteBudget with the other downloads
+#       25). SetMaxBytesInFlight() defined and implemented
 #  
 # TODO
 #   1. Update object documentation (i.e. interface, class, and implementation)
@@ -88,7 +134,23 @@ from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import StaleElementReferenceException
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
-import time, os, requests, csv, json, TitleParser, ImageFilter
+import time, os, re, csv, hashlib, TitleParser, ImageFilter, DownloadPool, HttpClient
+import MetadataStore, CSVHelper, PinIndex, Checkpoint, ImageStore, BrowserPool
+import LinkHarvester, Metrics, RateLimiter
+
+HARVEST_SECONDS = Metrics.Histogram('scraper_link_harvest_seconds',
+                                    'Time spent collecting the links of a board')
+PAGE_LOAD_SECONDS = Metrics.Histogram('scraper_page_load_seconds',
+                                      'Time spent loading pin pages')
+ELEMENT_WAIT_SECONDS = Metrics.Histogram('scraper_element_wait_seconds',
+                                         'Time spent waiting for pin page elements', ('element',))
+ELEMENT_TIMEOUTS = Metrics.Counter('scraper_element_timeouts_total',
+                                   'Pin page elements that never appeared', ('element',))
+DOWNLOAD_SECONDS = Metrics.Histogram('scraper_image_download_seconds',
+                                     'Time spent downloading images', ('source',))
+DISK_WRITE_SECONDS = Metrics.Histogram('scraper_disk_write_seconds',
+                                       'Time spent storing an image and writing its metadata')
+PINS = Metrics.Counter('scraper_pins_total', 'Pins by what happened to them', ('outcome',))
 
 class PinterestScraper:
     # desc: initializes webdriver object and logs into pinterest
@@ -105,22 +167,47 @@ class PinterestScraper:
     #       Holds the password we will use to login to pinterest account.
     #       If None, no login will be attempted (for public boards).
     def __init__(self, email=None, password=None):
-        options = Options()
-        options.headless = True
-        ignored_exceptions = (NoSuchElementException, StaleElementReferenceException)
-        self._browser = webdriver.Chrome('/Users/rileycullen/chromedriver', options=options)
-        self.__wait = WebDriverWait(self._browser, 2, ignored_exceptions=ignored_exceptions)
+        self.__waitTimeout = 2
+        self.__ignoredExceptions = (NoSuchElementException, StaleElementReferenceException)
+        self._browser = self.__CreateBrowser()
+        self.__wait = WebDriverWait(self._browser, self.__waitTimeout, ignored_exceptions=self.__ignoredExceptions)
         self.__hasLoggedIn = False
         self.__isRootSet = False
-        self.__isRootSet = False
         
         # Only attempt login if credentials are provided
         if email is not None and password is not None:
-        self.__captionsFilename = 'metadata.json'
+            self.Login(email, password)
+
+        self.__captionsFilename = 'metadata.jsonl'
+        self.__legacyCaptionsFilename = 'metadata.json'
+        self.__metadataStore = None
+        self.__csvWriter = None
         self.__csvFilename = 'infographics.csv'
+        self.__indexFilename = 'pins.sqlite3'
+        self.__pinIndex = None
+        self.__imageStoreDirname = '.image-store'
+        self.__titleCacheFilename = '.title-cache.sqlite3'
+        self.__titleResolver = None
+        self.__imageStore = None
+        self.__duplicateDistance = None
+        self.__checkpointFilename = 'checkpoint.json'
+        self.__checkpointInterval = 25
+        self.__links = []
+        self.__cursor = 0
         self.__keyword = ''
         self.__verticalMin = 0    # 500
         self.__horizontalMin = 0  # 450
+        self.__downloadWorkers = 4
+        self.__scrapeWorkers = 1
+        self.__maxBytesInFlight = 64 * 1024 * 1024
+        self.__byteBudget = None
+        self.__successCount = 1
+
+    # desc: Starts a headless Chrome instance
+    def __CreateBrowser(self):
+        options = Options()
+        options.headless = True
+        return webdriver.Chrome('/Users/rileycullen/chromedriver', options=options)
 
     # desc: Logs into pinterest account with parameterized email/password
     # post: __hasLoggedIn initialized to True if login was successful and false if
@@ -155,27 +242,29 @@ class PinterestScraper:
         else:
             self.__hasLoggedIn = False
 
-    # desc: Checks to see if there is a JSON file already in the directory that
-    #       the user wants to write to
+    # desc: Checks to see if there is a JSON Lines file already in the directory
+    #       that the user wants to write to. A metadata.json left behind by an
+    #       older version is imported into the new file.
     def __CheckForCaptionsTxt(self):
         path = self.__downloadPath + '/' + self.__captionsFilename
+        legacyPath = self.__downloadPath + '/' + self.__legacyCaptionsFilename
         if(not os.path.isfile(path)):
             print(path + ' not found... Creating a new copy')
             self.__CreateNewCaptionsTxt(path)
+            if (os.path.isfile(legacyPath)):
+                count = MetadataStore.ImportLegacyJSON(legacyPath, path)
+                print('Imported %d records from '%(count) + legacyPath)
             print('Done')
         else:
             print(path + ' found!')
 
-    # desc: Creates a new JSON file to hold the image captions
+    # desc: Creates a new JSON Lines file to hold the image captions
     # 
     # Parameters:
     # ---------------
-    # path : string holds the path of metadata.txt.
+    # path : string holds the path of metadata.jsonl.
     def __CreateNewCaptionsTxt(self, path):
         with open(path, 'w') as f:
-            data = {}
-            data['image'] = []
-            json.dump(data, f)
             f.close()
 
     # desc: Checks to see if there is a CSV file in the directory that the user
@@ -197,9 +286,8 @@ class PinterestScraper:
     #       Holds the path of infographics.csv in the filesystem.
     def __CreateNewCSVFile(self, csvPath):
         csvfile = open(csvPath, 'x', newline='')
-        filewriter = csv.writer(csvfile, delimiter=',', quotechar='|', quoting = 
-                                csv.QUOTE_MINIMAL)
-        filewriter.writerow(['Image filename, Search keyword, Partial caption, URL'])
+        filewriter = csv.writer(csvfile)
+        filewriter.writerow(CSVHelper.CSV_HEADER)
         csvfile.close()
 
     # desc: Checks if the user's directory exists
@@ -218,6 +306,28 @@ class PinterestScraper:
         except OSError as err:
             print(err)
 
+    # desc: Returns the directory the data for keyword is written to
+    #
+    # Parameters:
+    # ---------------
+    # keyword : string
+    #       Holds the search term associated with the directory
+    def __GetDownloadPath(self, keyword):
+        if (self.__isRootSet):
+            return self.__root + '/' + keyword.replace(" ", "")
+        return keyword.replace(" ", "")
+
+    # desc: Returns the directory of the ImageStore shared by every keyword
+    def __GetImageStorePath(self):
+        return self.__GetSharedPath(self.__imageStoreDirname)
+
+    # desc: Returns the path of a file shared by every keyword, in the root
+    #       directory next to the keyword directories
+    def __GetSharedPath(self, name):
+        if (self.__isRootSet):
+            return self.__root + '/' + name
+        return name
+
     def __DoesDirExist(self, dir):
         if (not os.path.isdir(dir)):
             return False
@@ -235,129 +345,444 @@ class PinterestScraper:
     # keyword : string
     #       Holds the search term associated with the linkSetURL.
     def GetLinkSet(self, linkSetURL, keyword):
-        MAX_TRIES = 5
-        tries = 0
-        linkSet = []
-        results = set()
-        
         self.__keyword = keyword
-        if (self.__isRootSet):
-            self.__downloadPath = self.__root + '/' + self.__keyword.replace(" ", "")
-        else:
-            self.__downloadPath = self.__keyword.replace(" ", "")
+        self.__downloadPath = self.__GetDownloadPath(keyword)
 
         self.__CheckForDownloadPath()
         self.__CheckForCSV()
         self.__CheckForCaptionsTxt()
 
-        self._browser.get(linkSetURL)
+        with HARVEST_SECONDS.Time():
+            self._browser.get(linkSetURL)
+            results = LinkHarvester.HarvestLinks(self._browser)
 
-        body = self._browser.find_element_by_tag_name('body')
+        # Keep the order the pins appear on the board, so cursor positions and
+        # image numbers follow the board rather than the link text.
+        self.__links = list(dict.fromkeys(results))
+        self.__cursor = 0
+        self.__SaveCheckpoint()
 
-        try:
-            while tries < MAX_TRIES:
-                print('tries: %d'%tries)
-                try:
-                    time.sleep(2)
-                    previousSet = linkSet
-                    linkSet = self.__wait.until(EC.presence_of_all_elements_located(
-					        (By.CSS_SELECTOR, "a[href*='/pin/']")))
-
-                    results = self.__RemoveDuplicates(results, linkSet)
-
-                    body.send_keys(Keys.PAGE_DOWN)
+    # desc: Loads the link set and progress cursor of an interrupted scrape so
+    #       ScrapeLinkset() continues from the last completed pin
+    #
+    # Parameters:
+    # ---------------
+    # keyword : string
+    #       Holds the search term of the interrupted scrape
+    #
+    # Return values:
+    # ----------------
+    # True if a checkpoint was found, False otherwise
+    def Resume(self, keyword):
+        downloadPath = self.__GetDownloadPath(keyword)
+        state = Checkpoint.Load(downloadPath + '/' + self.__checkpointFilename)
+        if (state is None):
+            print('No checkpoint found in ' + downloadPath)
+            return False
 
-                    if (previousSet != linkSet):
-                        tries = 0
-                    else:
-                        tries += 1
-                except (StaleElementReferenceException):
-                    pass
-        except KeyboardInterrupt:
-            pass
+        self.__keyword = state['keyword']
+        self.__downloadPath = downloadPath
+        self.__links = state['links']
+        self.__cursor = state['cursor']
+        print('Resuming at pin %d of %d'%(self.__cursor + 1, len(self.__links)))
+        return True
 
-        self.__links = results
+    # desc: Writes the link set and progress cursor to checkpoint.json
+    def __SaveCheckpoint(self):
+        Checkpoint.Save(self.__downloadPath + '/' + self.__checkpointFilename, {
+            'keyword': self.__keyword,
+            'links': self.__links,
+            'cursor': self.__cursor
+        })
     
     # desc: Goes to each link within the linkset and downloads an image, caption,
     #       title, and source. Also filters out images that are not bigger than
-    #       a user defined size.
+    #       a user defined size. Pin pages are scraped by scrapeWorkers browsers
+    #       at once, see SetScrapeWorkers().
     # pre:  hasLoggedIn must be true
     def ScrapeLinkset(self):
-        loopCount = 1
-        successCount = 1
-        captionContent = ''
-        titleContent = ''
-        srcContent = ''
-        doesTitleExist = False
+        self.__pinIndex = PinIndex.PinIndex(self.__downloadPath + '/' + self.__indexFilename)
+        self.__successCount = self.__GetNextImageNumber()
+        self.__imageStore = ImageStore.ImageStore(self.__GetImageStorePath(), self.__duplicateDistance)
+        self.__titleResolver = TitleParser.TitleResolver(self.__GetSharedPath(self.__titleCacheFilename))
+        self.__lastCheckpoint = self.__cursor
+        self.__nextPosition = self.__cursor
+
+        browserPool = BrowserPool.BrowserPool(self._browser, self.__CreateBrowser,
+                                              self.__waitTimeout, self.__ignoredExceptions)
+        self.__GrowConnectionPool()
+        pagePool = DownloadPool.DownloadPool(self.__scrapeWorkers, self.__scrapeWorkers * 2)
+        pool = DownloadPool.DownloadPool(self.__downloadWorkers)
+        if (self.__maxBytesInFlight is not None):
+            self.__byteBudget = HttpClient.ByteBudget(self.__maxBytesInFlight)
+        self.__metadataStore = MetadataStore.MetadataStore(
+            self.__downloadPath + '/' + self.__captionsFilename)
+        self.__csvWriter = CSVHelper.BufferedCSVWriter(
+            self.__downloadPath + '/' + self.__csvFilename)
         
-        for link in self.__links:
-            self._browser.get(link)
-            imageName = self.__keyword.replace(" ", "_") + '_%d.jpg'%(successCount)
-            print('(%d/%d): '%(loopCount, len(self.__links)) + link)
-            loopCount += 1
+        try:
+            self.__ScrapeLinks(pagePool, pool, browserPool)
+        finally:
+            self.__CommitPages(pagePool, pool, True)
+            pagePool.Shutdown()
+            browserPool.Close()
+            self.__CommitDownloads(pool, True)
+            pool.Shutdown()
+            self.__AdvanceCursor((pool, pagePool), self.__nextPosition)
+            if (self.__cursor >= len(self.__links)):
+                Checkpoint.Remove(self.__downloadPath + '/' + self.__checkpointFilename)
+                self.__RemovePartialDownloads()
+            else:
+                self.__Checkpoint()
+            self.__metadataStore.Close()
+            self.__metadataStore = None
+            self.__csvWriter.Close()
+            self.__csvWriter = None
+            self.__pinIndex.Close()
+            self.__pinIndex = None
+            self.__imageStore.Close()
+            self.__imageStore = None
+            self.__titleResolver.Close()
+            self.__titleResolver = None
+            self.__byteBudget = None
+            print('\nRun report:\n' + Metrics.Summary())
+            Metrics.Reset()
+
+    # desc: Removes the .part files of downloads that never finished. Only
+    #       called once every link has been visited, before then they are
+    #       resumed by the next run.
+    def __RemovePartialDownloads(self):
+        with os.scandir(self.__downloadPath) as it:
+            for entry in it:
+                if (entry.name.startswith('.download_') and entry.name.endswith('.part')):
+                    os.remove(entry.path)
+
+    # desc: Returns the number the next <keyword>_<n>.jpg should get, so a
+    #       rerun doesn't overwrite the images of earlier runs
+    def __GetNextImageNumber(self):
+        pattern = re.compile(re.escape(self.__keyword.replace(" ", "_")) + r'_(\d+)\.jpg$')
+        highest = 0
+        with os.scandir(self.__downloadPath) as it:
+            for entry in it:
+                match = pattern.match(entry.name)
+                if (match is not None):
+                    highest = max(highest, int(match.group(1)))
+        return highest + 1
+
+    # desc: Main loop of ScrapeLinkset(). Visits the links from the cursor on
+    #       and skips pins already in the PinIndex. Pin pages are scraped on
+    #       pagePool and image downloads run on pool; both are committed in
+    #       the order the links were submitted.
+    #
+    # Parameters:
+    # ---------------
+    # pagePool : DownloadPool
+    #       Pool the pin pages are scraped on, one browser per worker
+    #
+    # pool : DownloadPool
+    #       Pool the image downloads are submitted to
+    #
+    # browserPool : BrowserPool
+    #       Hands the page workers their browsers
+    def __ScrapeLinks(self, pagePool, pool, browserPool):
+        skipCount = 0
 
-            # Getting image download links
-            image = self.__wait.until(EC.presence_of_element_located((By.CSS_SELECTOR,"div[class='Pj7 sLG XiG eEj m1e'] > div[class='XiG zI7 iyn Hsu'] > img")))
+        for position in range(self.__cursor, len(self.__links)):
+            link = self.__links[position]
+            self.__AdvanceCursor((pool, pagePool), position)
+            # Counted in links visited rather than from the cursor, which a
+            # slow download can hold back for many links
+            if (position - self.__lastCheckpoint >= self.__checkpointInterval):
+                self.__Checkpoint()
+                self.__lastCheckpoint = position
 
+            if (self.__pinIndex.IsScraped(link, self.__horizontalMin, self.__verticalMin)):
+                PINS.Inc('skipped')
+                skipCount += 1
+            else:
+                pagePool.Submit({'position': position, 'link': link},
+                                self.__ScrapePin, browserPool, link)
+                self.__CommitPages(pagePool, pool, False)
+            self.__nextPosition = position + 1
+
+        print('Skipped %d pins that were already scraped'%(skipCount))
+
+    # desc: Scrapes one pin page on a page worker. Reads the image link, checks
+    #       the image against the bounds and, if it is kept, reads the title,
+    #       source and caption.
+    #
+    # Parameters:
+    # ---------------
+    # browserPool : BrowserPool
+    #       Hands the calling worker its browser
+    #
+    # link : string
+    #       Link to the pin page
+    #
+    # Return values:
+    # ----------------
+    # dict with the scraped fields. If 'is_kept' is True and 'stored' is None
+    # 'probe' holds the open ImageFilter.ImageProbe of the image. If
+    # 'probe_failed' is True the image couldn't be read, so it isn't known
+    # whether it is within the bounds.
+    def __ScrapePin(self, browserPool, link):
+        browser, wait = browserPool.Get()
+        with PAGE_LOAD_SECONDS.Time():
+            browser.get(link)
+        page = {'stored': None, 'probe': None, 'probe_failed': False}
+
+        # Getting image download links
+        image = self.__WaitFor(wait, 'image', "div[class='Pj7 sLG XiG eEj m1e'] > div[class='XiG zI7 iyn Hsu'] > img")
+        page['initial_link'] = image.get_attribute('src')
+        imageLink = self.__GetHighResImage(page['initial_link'])
+        page['image_link'] = imageLink
+
+        # An image already in the store is checked against the bounds it was
+        # stored with instead of being requested again
+        stored = self.__imageStore.LookupURL(imageLink)
+        if (stored is not None):
+            page['stored'] = stored[0]
+            page['is_kept'] = stored[1] > self.__horizontalMin and stored[2] > self.__verticalMin
+        else:
+            page['probe'], page['probe_failed'] = ImageFilter.ProbeImageBounds(
+                imageLink, self.__horizontalMin, self.__verticalMin)
+            page['is_kept'] = page['probe'] is not None
+        if (not page['is_kept']):
+            return page
+
+        try:
+            # Get title
             try:
-                print('Initial request: ' + image.get_attribute('src'))
-                imageLink = self.__GetHighResImage(image.get_attribute('src'))
-                print('Final Request: ' + imageLink)
-
-                if (ImageFilter.IsImageGreaterThanBounds(imageLink, self.__horizontalMin, self.__verticalMin)):
-                    # Get title
-                    try:
-                        title = self.__wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "h1[class='lH1 dyH iFc ky3 pBj DrD IZT']")))
-                        titleContent = title.text
-                        doesTitleExist = True
-                    except (TimeoutException):
-                        doesTitleExist = False
-                        titleContent = 'N/A'
-                    print('\nTitle content:\n\n' + titleContent)
-
-                    # Get source
-                    try:
-                        source = self.__wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[class='Jea jzS zI7 iyn Hsu'] a[class='linkModuleActionButton']")))
-                        srcContent = source.get_attribute('href')
-                    except:
-                        srcContent = 'N/A'
-                    print('\nSource content:\n\n' + srcContent)
-
-                # Get caption
-                    print('\nCaption content:\n')
-                    try:
-                        caption = self.__wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "span[class='tBJ dyH iFc MF7 pBj DrD IZT swG']")))
-                        captionContent = caption.text
-                    except (TimeoutException):
-                        captionContent = 'N/A'
-
-                    print(captionContent)
-
-                    if (titleContent == 'N/A' and srcContent != 'N/A'):
-                        try:
-                            titleContent = TitleParser.GetTitle(srcContent) 
-                        except:
-                            titleContent = 'N/A'
-
-                    # Write image to directory
-                    imageSuccess = self.__DownloadImage(imageLink, imageName)
-                    # Write caption to captions.txt in directory
-                    if (imageSuccess):
-                        successCount += 1
-                        captionSuccess = self.__WriteToMetadataFile(imageName, titleContent, srcContent, captionContent)
-                        if (captionSuccess):
-                            if (not doesTitleExist):
-                                self.__WriteToCSVFile(imageName, captionContent[0 : 20], link)
-                            else:
-                                self.__WriteToCSVFile(imageName, titleContent[0 : 20], link)
-                else:
-                    print('Image not greater than bounds: ' + imageLink)
+                title = self.__WaitFor(wait, 'title', "h1[class='lH1 dyH iFc ky3 pBj DrD IZT']")
+                page['title'] = title.text
+                page['does_title_exist'] = True
+            except (TimeoutException):
+                page['does_title_exist'] = False
+                page['title'] = 'N/A'
+
+            # Get source
+            try:
+                source = self.__WaitFor(wait, 'source', "div[class='Jea jzS zI7 iyn Hsu'] a[class='linkModuleActionButton']")
+                page['source'] = source.get_attribute('href')
             except:
+                page['source'] = 'N/A'
+
+            # Get caption
+            try:
+                caption = self.__WaitFor(wait, 'caption', "span[class='tBJ dyH iFc MF7 pBj DrD IZT swG']")
+                page['caption'] = caption.text
+            except (TimeoutException):
+                page['caption'] = 'N/A'
+
+            # The title is looked up in the background and filled in when
+            # the pin is committed
+            page['title_lookup'] = None
+            if (page['title'] == 'N/A' and page['source'] != 'N/A'):
+                page['title_lookup'] = self.__titleResolver.Resolve(page['source'])
+        except:
+            if (page['probe'] is not None):
+                page['probe'].Close()
+            raise
+        return page
+
+    # desc: Waits for the element matched by selector and records the wait,
+    #       and whether it timed out, in Metrics
+    #
+    # Parameters:
+    # ---------------
+    # wait : WebDriverWait
+    #       The calling worker's wait
+    #
+    # element : string
+    #       Name of the element in the metrics, e.g. 'title'
+    #
+    # selector : string
+    #       CSS selector of the element
+    def __WaitFor(self, wait, element, selector):
+        start = time.perf_counter()
+        try:
+            return wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        except TimeoutException:
+            ELEMENT_TIMEOUTS.Inc(element)
+            raise
+        finally:
+            ELEMENT_WAIT_SECONDS.Observe(time.perf_counter() - start, element)
+
+    # desc: Takes scraped pin pages off pagePool in the order they were
+    #       submitted, prints them, and submits the images that are kept to
+    #       pool
+    #
+    # Parameters:
+    # ---------------
+    # pagePool : DownloadPool
+    #       Pool the pin pages are scraped on
+    #
+    # pool : DownloadPool
+    #       Pool the image downloads are submitted to
+    #
+    # wait : bool
+    #       Whether to block until every pending page has been scraped
+    def __CommitPages(self, pagePool, pool, wait):
+        for pin, page in pagePool.Drain(wait):
+            position = pin['position']
+            print('(%d/%d): '%(position + 1, len(self.__links)) + pin['link'])
+            if (not page):
+                PINS.Inc('failed')
                 print('No image found (src = NULL)')
-            
+            else:
+                print('Initial request: ' + page['initial_link'])
+                print('Final Request: ' + page['image_link'])
+                if (page['stored'] is not None):
+                    print('Image already downloaded: ' + page['stored'])
+
+                if (page['is_kept']):
+                    print('\nTitle content:\n\n' + page['title'])
+                    print('\nSource content:\n\n' + page['source'])
+                    print('\nCaption content:\n')
+                    print(page['caption'])
+
+                    # Write image to directory in the background. The name
+                    # carries the image link so a resumed run only picks up
+                    # a .part file of the same image.
+                    tempName = '.download_%d_%s.part'%(
+                        position, hashlib.sha1(page['image_link'].encode('utf-8')).hexdigest()[:12])
+                    record = {
+                        'position': position,
+                        'link': pin['link'],
+                        'image_link': page['image_link'],
+                        'temp_name': tempName,
+                        'title': page['title'],
+                        'source': page['source'],
+                        'caption': page['caption'],
+                        'does_title_exist': page['does_title_exist'],
+                        'title_lookup': page['title_lookup']
+                    }
+                    if (page['stored'] is not None):
+                        record['temp_name'] = None
+                        pool.Submit(record, self.__ReuseImage, page['stored'])
+                    else:
+                        pool.Submit(record, self.__DownloadImage, page['image_link'], tempName, page['probe'])
+                    self.__CommitDownloads(pool, False)
+                elif (page['probe_failed']):
+                    # Left out of the index so the next run tries it again
+                    PINS.Inc('failed')
+                    print('Image could not be read: ' + page['image_link'])
+                else:
+                    PINS.Inc('rejected')
+                    print('Image not greater than bounds: ' + page['image_link'])
+                    self.__pinIndex.AddRejected(pin['link'], self.__horizontalMin, self.__verticalMin)
+
             print()
             print()
+        self.__CommitDownloads(pool, False)
 
+    # desc: Moves the cursor to the first pin whose result isn't on disk yet:
+    #       the oldest pin still in one of the pools, or nextPosition if they
+    #       are empty
+    #
+    # Parameters:
+    # ---------------
+    # pools : tuple
+    #       The DownloadPools pins pass through, the one pins reach last first
+    #
+    # nextPosition : int
+    #       Position of the next link the main loop will visit
+    def __AdvanceCursor(self, pools, nextPosition):
+        for pool in pools:
+            oldest = pool.PeekOldest()
+            if (oldest is not None):
+                self.__cursor = oldest['position']
+                return
+        self.__cursor = nextPosition
+
+    # desc: Flushes the metadata, CSV rows and index entries of every committed
+    #       pin and then saves the cursor, so the checkpoint never runs ahead of
+    #       what is on disk
+    def __Checkpoint(self):
+        self.__metadataStore.Flush()
+        self.__csvWriter.Flush()
+        self.__imageStore.Commit()
+        self.__pinIndex.Commit()
+        self.__SaveCheckpoint()
+
+    # desc: Renames finished downloads to <keyword>_<n>.jpg and writes their
+    #       metadata and CSV rows. Downloads are committed in the order they
+    #       were submitted so numbering matches the order the pins were visited.
+    #       Unless wait is True, a download whose title is still being looked up
+    #       is left in the pool, so the main loop doesn't block on the lookup.
+    #
+    # Parameters:
+    # ---------------
+    # pool : DownloadPool
+    #       Pool the image downloads were submitted to
+    #
+    # wait : bool
+    #       Whether to wait for every pending download to finish
+    def __CommitDownloads(self, pool, wait):
+        for record, result in pool.Drain(wait, self.__IsTitleResolved):
+            if (record['temp_name'] is not None):
+                tempPath = self.__downloadPath + '/' + record['temp_name']
+            else:
+                tempPath = None
+            if (not result):
+                PINS.Inc('failed')
+                if (tempPath is not None and os.path.isfile(tempPath)):
+                    os.remove(tempPath)
+                continue
+
+            if (record['title_lookup'] is not None):
+                record['title'] = record['title_lookup'].result()
+
+            with DISK_WRITE_SECONDS.Time():
+                self.__CommitDownload(record, tempPath, result)
+            PINS.Inc('downloaded' if tempPath is not None else 'reused')
+        self.__imageStore.Commit()
+        self.__pinIndex.Commit()
+
+    # desc: Returns whether the title of a download record is known, so it can
+    #       be committed without waiting on the lookup
+    #
+    # Parameters:
+    # ---------------
+    # record : dict
+    #       The record the download was submitted with
+    def __IsTitleResolved(self, record):
+        return (record['title_lookup'] is None or record['title_lookup'].done())
+
+    # desc: Stores one finished download, links it into the keyword directory
+    #       and writes its metadata, CSV row and index entry
+    #
+    # Parameters:
+    # ---------------
+    # record : dict
+    #       The record the download was submitted with
+    #
+    # tempPath : string
+    #       Path of the downloaded image, None if the image was already stored
+    #
+    # result : tuple
+    #       (content hash, fingerprint) returned by the download job
+    def __CommitDownload(self, record, tempPath, result):
+        contentHash, fingerprint = result
+        if (tempPath is not None):
+            contentHash = self.__imageStore.Add(tempPath, contentHash, record['image_link'], fingerprint)
+        imageName = self.__keyword.replace(" ", "_") + '_%d.jpg'%(self.__successCount)
+        self.__imageStore.Link(contentHash, self.__downloadPath + '/' + imageName)
+        self.__successCount += 1
+
+        # Write caption to captions.txt in directory
+        captionSuccess = self.__WriteToMetadataFile(imageName, record['title'], record['source'], record['caption'])
+        if (captionSuccess):
+            if (not record['does_title_exist']):
+                self.__WriteToCSVFile(imageName, record['caption'][0 : 20], record['link'])
+            else:
+                self.__WriteToCSVFile(imageName, record['title'][0 : 20], record['link'])
+
+        self.__pinIndex.AddDownloaded(record['link'], imageName, contentHash, {
+            'title': record['title'],
+            'source': record['source'],
+            'caption': record['caption']
+        })
 
     # desc: "Gets" the high res image by replacing /236x/ with /736x/ in the URL
     # 
@@ -371,7 +796,11 @@ class PinterestScraper:
             finalLink = imageLink.replace('/236x/', '/736x/')
         return finalLink
 
-    # desc: Downloads picture to local disk
+    # desc: Downloads picture to local disk. The image is streamed to imageName
+    #       chunk by chunk, and __CommitDownload() moves it into the
+    #       ImageStore once it is complete. A partial file left under
+    #       imageName by an interrupted run is resumed instead of downloaded
+    #       again.
     # 
     # Parameters:
     # ---------------
@@ -379,19 +808,63 @@ class PinterestScraper:
     #       Holds the link to the image we want to download
     #
     # imageName : string
-    #       Holds the name we want to save the image as
-    def __DownloadImage(self, imageLink, imageName):
+    #       Holds the name of the .part file the image is written to
+    #
+    # probe : ImageFilter.ImageProbe, optional
+    #       Open probe of imageLink. If given, the image is read from the probe
+    #       instead of being requested again.
+    #
+    # Return values:
+    # ----------------
+    # (SHA-256 of the image as a hex string, ImageFilter.FingerprintImage()
+    # result), or False if the download failed
+    def __DownloadImage(self, imageLink, imageName, probe=None):
+        path = self.__downloadPath + '/' + imageName
+        sizeHint = probe.contentLength if probe is not None else None
+        if (probe is not None and os.path.isfile(path)):
+            # Reading the rest of the image is cheaper than the whole probe
+            probe.Close()
+            probe = None
+
+        if (probe is not None):
+            reserved = self.__byteBudget.Acquire(probe.contentLength) if self.__byteBudget is not None else 0
+            try:
+                contentHash = hashlib.sha256()
+                with DOWNLOAD_SECONDS.Time('probe'):
+                    with open(path, 'wb') as f:
+                        for chunk in probe.IterContent():
+                            contentHash.update(chunk)
+                            f.write(chunk)
+                        f.close()
+                return contentHash.hexdigest(), ImageFilter.FingerprintImage(path)
+            except:
+                # The probe's connection may have gone stale while the pin
+                # was being scraped, request the rest of the image
+                pass
+            finally:
+                probe.Close()
+                if (self.__byteBudget is not None):
+                    self.__byteBudget.Release(reserved)
+
         try:
-            pictureRequest = requests.get(imageLink)
-            with open(self.__downloadPath + '/' + imageName, 'wb') as f:
-                f.write(pictureRequest.content)
-                f.close()
-            return True
-        except:
-            print('Error: Image request failed')
+            with DOWNLOAD_SECONDS.Time('request'):
+                contentHash = HttpClient.Download(imageLink, path, self.__byteBudget, sizeHint)
+            return contentHash, ImageFilter.FingerprintImage(path)
+        except Exception as exc:
+            print('Error: Image request failed (%s)'%(exc))
             return False
 
-    # desc: Writes captions to caption.txt on local disk
+    # desc: Stands in for __DownloadImage() when the image is already in the
+    #       ImageStore, so the pin is committed in order with the downloads
+    #
+    # Parameters:
+    # ---------------
+    # contentHash : string
+    #       Hash of the stored image
+    def __ReuseImage(self, contentHash):
+        return contentHash, None
+
+    # desc: Appends captions to metadata.jsonl on local disk
     # 
     # Parameters:
     # ---------------
@@ -407,32 +880,39 @@ class PinterestScraper:
     # caption : string
     #       Caption associated with the saved image
     def __WriteToMetadataFile(self, imageName, title, source, caption):
-        path = self.__downloadPath + '/' + self.__captionsFilename
-        data = {}
-        helper = 0
-        with open(path,) as captionsFile:
-            # content = "(" + imageName + "):\n\n" + caption + "\n\n"
-            # captionsFile.write(content)
-            helper = json.load(captionsFile)
-            tmp = helper['image']
-
-            data = {
-                'image_filename': imageName,
-                'title': title, 
-                'source': source,
-                'caption': caption
-            }
-
-            tmp.append(data)
-            captionsFile.close()
-        
-        with open(path, 'w') as captionsFile:
-            json.dump(helper, captionsFile, indent=4)
-            captionsFile.close()
-            return True
+        data = {
+            'image_filename': imageName,
+            'title': title, 
+            'source': source,
+            'caption': caption
+        }
 
+        try:
+            self.__metadataStore.Append(data)
+            return True
+        except OSError as err:
+            print(err)
         return False
 
+    # desc: Compacts metadata.jsonl for keyword and exports it to metadata.json
+    #       in the legacy {"image": [...]} layout
+    #
+    # Parameters:
+    # ---------------
+    # keyword : string
+    #       Holds the search term whose directory we want to export
+    def ExportMetadata(self, keyword):
+        downloadPath = self.__GetDownloadPath(keyword)
+        path = downloadPath + '/' + self.__captionsFilename
+        if (not os.path.isfile(path)):
+            print(path + ' not found!')
+            return False
+
+        MetadataStore.Compact(path)
+        count = MetadataStore.ExportLegacyJSON(path, downloadPath + '/' + self.__legacyCaptionsFilename)
+        print('Exported %d records to '%(count) + downloadPath + '/' + self.__legacyCaptionsFilename)
+        return True
+
     # desc: Writes image name, keyword, a partial caption, and url to CSV
     # 
     # Parameters:
@@ -446,28 +926,7 @@ class PinterestScraper:
     # url : string
     #       URL to the pin we want to download
     def __WriteToCSVFile(self, imageName, partialCaption, url):
-        csvPath = self.__downloadPath + '/' + self.__csvFilename
-        with open(csvPath, 'a+', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow([imageName, self.__keyword, partialCaption, url])
-
-    # desc: Removes duplicate links from linkset 
-    # 
-    # Parameters:
-    # ---------------
-    # results : set
-    #       A set of pins scraped from the user given pinterest board with the 
-    #       duplicate pins removed
-    #
-    # linkSet : list
-    #       A list of pins from the most recent scrape of the board
-    def __RemoveDuplicates(self, results, linkSet):
-        helper = set(results)
-        for link in linkSet:
-            if link.get_attribute('href') not in helper:
-                results.add(link.get_attribute('href'))
-                helper.add(link.get_attribute('href'))
-        return helper
+        self.__csvWriter.WriteRow([imageName, self.__keyword, partialCaption, url])
 
     def SetRoot(self, root):
         if (self.__DoesDirExist(root)):
@@ -477,6 +936,77 @@ class PinterestScraper:
         self.__isRootSet = False
         return False
 
+    # desc: Sets how many images are downloaded at the same time
+    #
+    # Parameters:
+    # ---------------
+    # workers : int
+    #       Number of download worker threads, must be at least 1
+    def SetDownloadWorkers(self, workers):
+        if (workers < 1):
+            return False
+        self.__downloadWorkers = workers
+        self.__GrowConnectionPool()
+        return True
+
+    # desc: Sets how many browsers scrape pin pages at the same time. Every
+    #       browser but the scraper's own is started for the scrape and logged
+    #       in with its cookies.
+    #
+    # Parameters:
+    # ---------------
+    # workers : int
+    #       Number of browsers, must be at least 1
+    def SetScrapeWorkers(self, workers):
+        if (workers < 1):
+            return False
+        self.__scrapeWorkers = workers
+        self.__GrowConnectionPool()
+        return True
+
+    # desc: Sets how many bytes the image downloads may have in flight
+    #       together. Downloads wait for earlier ones to finish rather than go
+    #       over it.
+    #
+    # Parameters:
+    # ---------------
+    # maxBytes : int
+    #       Bytes allowed in flight, must be at least 1. None removes the
+    #       limit.
+    def SetMaxBytesInFlight(self, maxBytes):
+        if (maxBytes is not None and maxBytes < 1):
+            return False
+        self.__maxBytesInFlight = maxBytes
+        return True
+
+    # desc: Makes sure HttpClient keeps enough connections open for every
+    #       image probe the pools can hold open at once
+    def __GrowConnectionPool(self):
+        # Every download the pool holds, queued or running, keeps its probe
+        # open, plus one more while Submit() waits for the oldest. Every page
+        # worker can hold open the probes of the pages waiting to be committed
+        # on top of its own.
+        connections = (self.__downloadWorkers * DownloadPool.PENDING_PER_WORKER + 1
+                       + self.__scrapeWorkers * 3)
+        if (HttpClient.GetPoolSize() < connections):
+            HttpClient.Configure(poolSize=connections)
+        if (RateLimiter.GetMaxConcurrency() < connections):
+            RateLimiter.Configure(maxConcurrency=connections)
+
+    # desc: Sets how close an image's perceptual hash must be to a stored
+    #       image's for it to be treated as the same image
+    #
+    # Parameters:
+    # ---------------
+    # distance : int
+    #       Number of bits the hashes may differ in, between 0 and
+    #       ImageStore.MAX_DISTANCE. None only shares byte-identical images.
+    def SetDuplicateDistance(self, distance):
+        if (distance is not None and not 0 <= distance <= ImageStore.MAX_DISTANCE):
+            return False
+        self.__duplicateDistance = distance
+        return True
+
     def SetBounds(self, hMin, vMin):
         if (hMin <= 0 or vMin <= 0):
             return False
@@ -0,0 +1,356 @@
+# RateLimiter.py
+# Created on October 18, 2026
+
+# Revision History:
+#   October 18, 2026:
+#       1). HostLimiter, RateLimiter, Configure(), GetLimiter() and
+#           ParseRetryAfter() defined and implemented so every outbound request
+#           is paced per host and backs off when the host pushes back
+#       2). SetLimits() defined and implemented so Configure() keeps what the
+#           hosts have learned, AcquireAsync() woken by Release()
+
+import asyncio, email.utils, threading, time
+from urllib.parse import urlsplit
+import Metrics
+
+DEFAULT_RATE = 20.0             # requests per second per host
+DEFAULT_BURST = 20              # requests that can be sent back to back
+DEFAULT_MAX_CONCURRENCY = 16    # requests waiting on a host at the same time
+INITIAL_CONCURRENCY = 4
+MIN_RATE = 0.5
+RATE_STEP = 1.0                 # requests per second regained per second of success
+DECREASE_FACTOR = 0.5
+DECREASE_INTERVAL = 1.0         # seconds, a burst of failures only backs off once
+LATENCY_FACTOR = 4.0            # slower than this times the fastest response is congestion
+LATENCY_FLOOR = 1.0             # seconds, faster responses are never congestion
+MAX_RETRY_AFTER = 120.0
+
+# Statuses that ask the client to slow down. Requests answered with them are
+# retried once the host may be asked again.
+THROTTLE_STATUSES = (429, 503)
+CONGESTION_STATUSES = (429, 500, 502, 503, 504)
+
+WAIT_SECONDS = Metrics.Histogram('ratelimit_wait_seconds',
+                                 'Time requests waited for the rate limiter of their host')
+BACKOFFS = Metrics.Counter('ratelimit_backoffs_total',
+                           'Times a host was slowed down by why', ('reason',))
+
+class HostLimiter:
+    # desc: Paces the requests to one host with a token bucket and limits how
+    #       many are waiting on it at once. Both limits adapt AIMD style: every
+    #       success raises them a little, a 429, 5xx, connection error or
+    #       unusually slow response halves them. A Retry-After header blocks
+    #       the host until it has passed. Safe to share between threads and
+    #       event loops.
+    #
+    # Parameters:
+    # ---------------
+    # host : string
+    #       Host the limiter paces, only used in messages
+    #
+    # rate : float
+    #       Most requests per second the host is sent
+    #
+    # burst : int
+    #       Most requests sent back to back after the host has been idle
+    #
+    # maxConcurrency : int
+    #       Most requests waiting on the host at the same time
+    def __init__(self, host, rate, burst, maxConcurrency):
+        self.host = host
+        self.__maxRate = float(rate)
+        self.__rate = float(rate)
+        self.__burst = max(1, burst)
+        self.__tokens = float(self.__burst)
+        self.__lastRefill = time.monotonic()
+        self.__maxConcurrency = max(1, maxConcurrency)
+        self.__limit = float(min(INITIAL_CONCURRENCY, self.__maxConcurrency))
+        self.__inFlight = 0
+        self.__blockedUntil = 0.0
+        self.__lastDecrease = 0.0
+        self.__fastest = None
+        self.__condition = threading.Condition()
+        self.__waiters = []     # (loop, future) of coroutines in AcquireAsync()
+
+    # desc: Takes a slot and a token if both are free. Must be called with
+    #       __condition held.
+    #
+    # Return values:
+    # ----------------
+    # 0 if the request may be sent, the seconds until it may be tried again,
+    # or None if it has to wait for a running request to finish
+    def __TryAcquire(self):
+        now = time.monotonic()
+        if (now < self.__blockedUntil):
+            return self.__blockedUntil - now
+        if (self.__inFlight >= int(self.__limit)):
+            return None
+
+        self.__tokens = min(self.__burst, self.__tokens + (now - self.__lastRefill) * self.__rate)
+        self.__lastRefill = now
+        if (self.__tokens < 1):
+            return (1 - self.__tokens) / self.__rate
+        self.__tokens -= 1
+        self.__inFlight += 1
+        return 0
+
+    # desc: Blocks until a request to the host may be sent. Every Acquire()
+    #       must be followed by a Release().
+    def Acquire(self):
+        start = time.monotonic()
+        with self.__condition:
+            while True:
+                wait = self.__TryAcquire()
+                if (wait == 0):
+                    break
+                self.__condition.wait(wait)
+        WAIT_SECONDS.Observe(time.monotonic() - start)
+
+    # desc: Acquire() for coroutines, waits without blocking the event loop.
+    #       A coroutine waiting for a slot is woken by the Release() that frees
+    #       it, whichever thread or loop that runs on.
+    async def AcquireAsync(self):
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.__condition:
+                wait = self.__TryAcquire()
+                if (wait == 0):
+                    break
+                waiter = (loop, loop.create_future())
+                self.__waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter[1], wait)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self.__condition:
+                    if (waiter in self.__waiters):
+                        self.__waiters.remove(waiter)
+        WAIT_SECONDS.Observe(time.monotonic() - start)
+
+    # desc: Wakes every thread and coroutine waiting in Acquire() or
+    #       AcquireAsync(). Must be called with __condition held.
+    def __WakeWaiters(self):
+        self.__condition.notify_all()
+        for loop, future in self.__waiters:
+            loop.call_soon_threadsafe(_Wake, future)
+        self.__waiters = []
+
+    # desc: Frees the slot taken by Acquire() and adapts the limits to how the
+    #       request went
+    #
+    # Parameters:
+    # ---------------
+    # status : int, optional
+    #       HTTP status of the response. None if there was no response.
+    #
+    # latency : float, optional
+    #       Seconds until the response arrived
+    #
+    # retryAfter : float, optional
+    #       Seconds the host asked to be left alone for
+    #
+    # failed : bool
+    #       Whether the request failed to connect or timed out. Requests that
+    #       failed for other reasons (e.g. a malformed URL) pass neither a
+    #       status nor failed and leave the limits as they are.
+    def Release(self, status=None, latency=None, retryAfter=None, failed=False):
+        with self.__condition:
+            self.__inFlight -= 1
+            now = time.monotonic()
+            if (retryAfter is not None and retryAfter > 0):
+                self.__blockedUntil = max(self.__blockedUntil, now + min(retryAfter, MAX_RETRY_AFTER))
+
+            reason = self.__GetCongestion(status, latency, failed)
+            if (reason is not None):
+                self.__Decrease(now, reason)
+            elif (status is not None):
+                self.__Increase()
+            self.__WakeWaiters()
+
+    def __GetCongestion(self, status, latency, failed):
+        if (failed):
+            return 'error'
+        if (status in CONGESTION_STATUSES):
+            return str(status)
+        if (latency is not None and status is not None and status < 400):
+            if (self.__fastest is None or latency < self.__fastest):
+                self.__fastest = latency
+            if (latency > max(LATENCY_FLOOR, LATENCY_FACTOR * self.__fastest)):
+                return 'latency'
+        return None
+
+    # desc: Multiplicative decrease, at most once per DECREASE_INTERVAL so the
+    #       requests already in flight when the host pushed back don't halve
+    #       the limits once each
+    def __Decrease(self, now, reason):
+        if (now - self.__lastDecrease < DECREASE_INTERVAL):
+            return
+        self.__lastDecrease = now
+        self.__limit = max(1.0, self.__limit * DECREASE_FACTOR)
+        self.__rate = max(MIN_RATE, self.__rate * DECREASE_FACTOR)
+        self.__tokens = min(self.__tokens, 1.0)
+        BACKOFFS.Inc(reason)
+
+    # desc: Additive increase. Every success adds a fraction of a step, so
+    #       over one round of requests the concurrency limit grows by about one
+    #       and over one second the rate grows by about RATE_STEP.
+    def __Increase(self):
+        self.__limit = min(float(self.__maxConcurrency), self.__limit + 1.0 / self.__limit)
+        self.__rate = min(self.__maxRate, self.__rate + RATE_STEP / self.__rate)
+
+    # desc: Changes the limits the host adapts within. The learned rate and
+    #       concurrency limit and any Retry-After block are kept; they are
+    #       only lowered to fit under smaller limits and grow towards larger
+    #       ones as requests succeed. Limits left as None are kept.
+    #
+    # Parameters:
+    # ---------------
+    # rate : float, optional
+    #       Most requests per second the host is sent
+    #
+    # burst : int, optional
+    #       Most requests sent back to back after the host has been idle
+    #
+    # maxConcurrency : int, optional
+    #       Most requests waiting on the host at the same time
+    def SetLimits(self, rate=None, burst=None, maxConcurrency=None):
+        with self.__condition:
+            if (rate is not None):
+                self.__maxRate = float(rate)
+                self.__rate = min(self.__rate, self.__maxRate)
+            if (burst is not None):
+                self.__burst = max(1, burst)
+                self.__tokens = min(self.__tokens, float(self.__burst))
+            if (maxConcurrency is not None):
+                self.__maxConcurrency = max(1, maxConcurrency)
+                self.__limit = min(self.__limit, float(self.__maxConcurrency))
+            self.__WakeWaiters()
+
+    # desc: Returns (concurrency limit, requests per second, requests in
+    #       flight), e.g. for reports
+    def GetState(self):
+        with self.__condition:
+            return int(self.__limit), self.__rate, self.__inFlight
+
+# desc: Resolves a coroutine's waiter future, unless its wait already ended
+def _Wake(future):
+    if (not future.done()):
+        future.set_result(None)
+
+class RateLimiter:
+    # desc: Hands out one HostLimiter per host, created on first use with the
+    #       limiter's settings
+    #
+    # Parameters:
+    # ---------------
+    # rate : float
+    #       Most requests per second sent to each host
+    #
+    # burst : int
+    #       Most requests sent back to back to an idle host
+    #
+    # maxConcurrency : int
+    #       Most requests waiting on each host at the same time
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, maxConcurrency=DEFAULT_MAX_CONCURRENCY):
+        self.__rate = rate
+        self.__burst = burst
+        self.__maxConcurrency = maxConcurrency
+        self.__hosts = {}
+        self.__lock = threading.Lock()
+
+    # desc: Returns the HostLimiter of the host url points to
+    def Get(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.__lock:
+            limiter = self.__hosts.get(host)
+            if (limiter is None):
+                limiter = HostLimiter(host, self.__rate, self.__burst, self.__maxConcurrency)
+                self.__hosts[host] = limiter
+            return limiter
+
+    # desc: Changes the settings new hosts start with and the limits of the
+    #       hosts already seen, see HostLimiter.SetLimits()
+    def SetLimits(self, rate=None, burst=None, maxConcurrency=None):
+        with self.__lock:
+            if (rate is not None):
+                self.__rate = rate
+            if (burst is not None):
+                self.__burst = burst
+            if (maxConcurrency is not None):
+                self.__maxConcurrency = maxConcurrency
+            hosts = list(self.__hosts.values())
+        for limiter in hosts:
+            limiter.SetLimits(rate, burst, maxConcurrency)
+
+__lock = threading.Lock()
+__settings = {
+    'rate': DEFAULT_RATE,
+    'burst': DEFAULT_BURST,
+    'max_concurrency': DEFAULT_MAX_CONCURRENCY
+}
+__limiter = None
+
+# desc: Changes the settings of the shared limiter used by HttpClient.
+#       Settings left as None are kept. Hosts already seen keep their backoff
+#       and Retry-After blocks, see HostLimiter.SetLimits().
+#
+# Parameters:
+# ---------------
+# rate : float, optional
+#       Most requests per second sent to each host
+#
+# burst : int, optional
+#       Most requests sent back to back to an idle host
+#
+# maxConcurrency : int, optional
+#       Most requests waiting on each host at the same time
+def Configure(rate=None, burst=None, maxConcurrency=None):
+    with __lock:
+        if (rate is not None):
+            __settings['rate'] = rate
+        if (burst is not None):
+            __settings['burst'] = burst
+        if (maxConcurrency is not None):
+            __settings['max_concurrency'] = maxConcurrency
+        limiter = __limiter
+    if (limiter is not None):
+        limiter.SetLimits(rate, burst, maxConcurrency)
+
+def GetMaxConcurrency():
+    return __settings['max_concurrency']
+
+# desc: Returns the shared HostLimiter of the host url points to
+def GetLimiter(url):
+    global __limiter
+    with __lock:
+        if (__limiter is None):
+            __limiter = RateLimiter(__settings['rate'], __settings['burst'],
+                                    __settings['max_concurrency'])
+        limiter = __limiter
+    return limiter.Get(url)
+
+# desc: Converts the value of a Retry-After header to seconds
+#
+# Parameters:
+# ---------------
+# value : string
+#       Either a number of seconds or an HTTP date
+#
+# Return values:
+# ----------------
+# Seconds to wait, or None if value is missing or can't be read
+def ParseRetryAfter(value):
+    if (not value):
+        return None
+    value = value.strip()
+    if (value.isdigit()):
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if (date is None):
+        return None
+    return max(0.0, date.timestamp() - time.time())
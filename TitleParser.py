@@ -5,31 +5,219 @@
 # Revision History:
 #   May 15, 2020:
 #       1). GetTitle defined and implemented
+#   October 18, 2026:
+#       1). GetTitle requests pages through the shared HttpClient session
+#       2). GetTitle streams the page and stops reading at </title> instead of
+#           downloading the whole page and parsing it with BeautifulSoup
+#       3). TitleCache and TitleResolver defined and implemented so titles are
+#           cached on disk and looked up on a worker pool
+#       4). GetTitle and TitleResolver record their timings and cache hits in
+#           Metrics
 
 # TODO: If empty title, pass N/A
 
-import bs4, requests
+import re, sqlite3, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+import requests, HttpClient, Metrics
 
-# desc: This function goes to a user specified url and gets that website's title 
+CHUNK_SIZE = 8 * 1024
+MAX_TITLE_BYTES = 256 * 1024    # give up on pages without </title> by then
+CACHE_TTL = 7 * 24 * 3600       # seconds a title is reused
+NEGATIVE_CACHE_TTL = 3600       # seconds a failed lookup is remembered
+DEFAULT_WORKERS = 4
+
+TITLE_END_PATTERN = re.compile(rb'</title\s*>', re.IGNORECASE)
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+FETCH_SECONDS = Metrics.Histogram('scraper_title_fetch_seconds',
+                                  'Time spent fetching the title of a source page')
+LOOKUPS = Metrics.Counter('scraper_title_lookups_total',
+                          'Title lookups by where the title came from', ('result',))
+
+class TitleHTMLParser(HTMLParser):
+    # desc: Collects the text of the first <title> element fed to it
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.__parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if (tag == 'title' and self.title is None and self.__parts is None):
+            self.__parts = []
+
+    def handle_endtag(self, tag):
+        if (tag == 'title' and self.__parts is not None):
+            self.title = ''.join(self.__parts)
+            self.__parts = None
+
+    def handle_data(self, data):
+        if (self.__parts is not None):
+            self.__parts.append(data)
+
+# desc: Decodes the head of a page with the charset from its headers or its
+#       <meta> tag, falling back to UTF-8
+def __Decode(head, response):
+    encoding = None
+    if ('charset' in response.headers.get('content-type', '').lower()):
+        encoding = response.encoding
+    if (encoding is None):
+        match = CHARSET_PATTERN.search(head)
+        if (match is not None):
+            encoding = match.group(1).decode('ascii')
+    try:
+        return head.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return head.decode('utf-8', errors='replace')
+
+# desc: This function goes to a user specified url and gets that website's title.
+#       The page is streamed and reading stops as soon as </title> has been
+#       seen.
 #
 # Parameters:
 # ------------
 # url - string
-#       Holds the URL that we want to get the title from 
+#       Holds the URL that we want to get the title from
 def GetTitle(url):
+    with FETCH_SECONDS.Time():
+        return __GetTitle(url)
+
+def __GetTitle(url):
     title = "N/A"
     userAgent = {'User-agent': 'Mozilla/5.0'}
-    requestsObject = requests.get(url, headers = userAgent)
+    requestsObject = HttpClient.Get(url, headers = userAgent, stream = True)
     try:
         requestsObject.raise_for_status()
-        soupObj = bs4.BeautifulSoup(requestsObject.text, "html.parser")
+        head = b''
+        for chunk in requestsObject.iter_content(CHUNK_SIZE):
+            head += chunk
+            # </title> may straddle two chunks, so look a little before chunk
+            if (TITLE_END_PATTERN.search(head, max(0, len(head) - len(chunk) - 16)) or
+                    len(head) >= MAX_TITLE_BYTES):
+                break
 
-        title = soupObj.find("title").string
-        if (len(title) == 0):
-            title = 'N/A'
-    except requests.exceptions.HTTPError:   
+        parser = TitleHTMLParser()
+        parser.feed(__Decode(head, requestsObject))
+        if (parser.title is not None and len(parser.title.strip()) != 0):
+            title = parser.title.strip()
+    except requests.exceptions.HTTPError:
         pass
     except requests.exceptions.RequestException as exc:
-        print(exc) 
+        print(exc)
+    finally:
+        requestsObject.close()
 
     return title
+
+class TitleCache:
+    # desc: SQLite cache of page titles keyed by URL. Titles are reused for
+    #       CACHE_TTL seconds, failed lookups (stored as 'N/A') for
+    #       NEGATIVE_CACHE_TTL seconds. Safe to share between threads.
+    #
+    # Parameters:
+    # ---------------
+    # path : string
+    #       Path of the SQLite database. Created if it doesn't exist.
+    def __init__(self, path):
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS titles ('
+            '    url TEXT PRIMARY KEY,'
+            '    title TEXT NOT NULL,'
+            '    fetched_at REAL NOT NULL'
+            ')')
+        self.__connection.commit()
+
+    # desc: Returns the cached title of url, or None if it isn't cached or has
+    #       expired
+    def Get(self, url):
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT title, fetched_at FROM titles WHERE url = ?', (url,)).fetchone()
+        if (row is None):
+            return None
+        ttl = NEGATIVE_CACHE_TTL if row[0] == 'N/A' else CACHE_TTL
+        if (time.time() - row[1] > ttl):
+            return None
+        return row[0]
+
+    def Set(self, url, title):
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO titles VALUES (?, ?, ?)', (url, title, time.time()))
+            self.__connection.commit()
+
+    def Close(self):
+        with self.__lock:
+            self.__connection.close()
+
+class TitleResolver:
+    # desc: Looks up page titles on a pool of worker threads so the browser
+    #       loop doesn't wait on external sites. Lookups of a URL that is
+    #       already being looked up share the same future.
+    #
+    # Parameters:
+    # ---------------
+    # cachePath : string, optional
+    #       Path of the TitleCache database. Without one nothing is cached
+    #       between lookups that aren't running at the same time.
+    #
+    # workers : int
+    #       Number of titles looked up at the same time
+    def __init__(self, cachePath=None, workers=DEFAULT_WORKERS):
+        self.__cache = TitleCache(cachePath) if cachePath is not None else None
+        self.__executor = ThreadPoolExecutor(max_workers=workers,
+                                             thread_name_prefix='title')
+        self.__inFlight = {}
+        # Reentrant because a lookup that finished before its done callback
+        # was added runs the callback while Resolve() holds the lock
+        self.__lock = threading.RLock()
+
+    # desc: Starts looking up the title of url
+    #
+    # Parameters:
+    # ---------------
+    # url : string
+    #       Link to the page
+    #
+    # Return values:
+    # ----------------
+    # A future that resolves to the title, or 'N/A' if the page has none or
+    # couldn't be read
+    def Resolve(self, url):
+        with self.__lock:
+            future = self.__inFlight.get(url)
+            if (future is None):
+                future = self.__executor.submit(self.__Lookup, url)
+                self.__inFlight[url] = future
+                future.add_done_callback(lambda done: self.__Forget(url))
+            return future
+
+    def __Forget(self, url):
+        with self.__lock:
+            self.__inFlight.pop(url, None)
+
+    def __Lookup(self, url):
+        if (self.__cache is not None):
+            title = self.__cache.Get(url)
+            if (title is not None):
+                LOOKUPS.Inc('cache')
+                return title
+
+        try:
+            title = GetTitle(url)
+        except Exception as exc:
+            print(exc)
+            title = 'N/A'
+        LOOKUPS.Inc('fetched' if title != 'N/A' else 'failed')
+
+        if (self.__cache is not None):
+            self.__cache.Set(url, title)
+        return title
+
+    # desc: Waits for running lookups and stops the worker threads
+    def Close(self):
+        self.__executor.shutdown(wait=True)
+        if (self.__cache is not None):
+            self.__cache.Close()
@@ -2,21 +2,53 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import asyncio
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, replace
+from typing import Annotated, AsyncIterator, Iterable, Iterator, List, Literal, Optional, Set, Tuple
 from urllib.parse import urlparse
+from xml.etree.ElementTree import ParseError
 
-import requests
-from bs4 import BeautifulSoup
-from fastapi import FastAPI, HTTPException
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field, HttpUrl
 
+import Metrics
+from backend.feed_cache import CachedFeed, FeedCache
+from backend.feed_parser import FeedItem, FeedParser, parse_feed
+from backend.keyword_filter import KeywordMatcher, get_matcher
+from backend.serialization import FastJSONResponse, dumps
+from backend.singleflight import SingleFlight
+from backend.upstream import UpstreamClient
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
 )
 REQUEST_TIMEOUT = 15
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+BATCH_MAX_BOARDS = 200
+KEYWORD_MAX_LENGTH = 200
+UPSTREAM_MAX_CONNECTIONS = int(os.environ.get("UPSTREAM_MAX_CONNECTIONS", "200"))
+UPSTREAM_PER_HOST_LIMIT = int(os.environ.get("UPSTREAM_PER_HOST_LIMIT", "20"))
+UPSTREAM_RATE_LIMIT = float(os.environ.get("UPSTREAM_RATE_LIMIT", "20"))
+FEED_CACHE_TTL = float(os.environ.get("FEED_CACHE_TTL", "300"))
+FEED_CACHE_MAX_BYTES = int(os.environ.get("FEED_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_SECONDS = Metrics.Histogram(
+    "backend_request_seconds", "Time until the response starts, by route", ("method", "route", "status")
+)
+UPSTREAM_FETCH_SECONDS = Metrics.Histogram(
+    "backend_upstream_fetch_seconds", "Time spent fetching board feeds from Pinterest"
+)
+FEED_PARSE_SECONDS = Metrics.Histogram("backend_feed_parse_seconds", "Time spent parsing fully downloaded feeds")
+FEED_LOADS = Metrics.Counter("backend_feed_loads_total", "Board feed loads by how they were served", ("source",))
 
 
 class ScrapeRequest(BaseModel):
@@ -26,7 +58,15 @@ class ScrapeRequest(BaseModel):
     keyword: Optional[str] = Field(
         default=None,
         description="Optional keyword filter that matches against pin titles and descriptions.",
-        max_length=200,
+        max_length=KEYWORD_MAX_LENGTH,
+    )
+    keywords: List[Annotated[str, Field(max_length=KEYWORD_MAX_LENGTH)]] = Field(
+        default_factory=list,
+        description="Additional keywords matched case-insensitively against pin titles and descriptions.",
+        max_length=100,
+    )
+    keyword_mode: Literal["any", "all"] = Field(
+        default="any", description="Whether a pin must match any or all of the keywords."
     )
     min_width: int = Field(
         default=0, ge=0, le=10000, description="Minimum image width required for a pin to be returned."
@@ -39,9 +79,25 @@ class ScrapeRequest(BaseModel):
     password: Optional[str] = Field(default=None, description="Password (unused for public boards).")
 
 
-@dataclass
+class BatchScrapeRequest(BaseModel):
+    """Request body for scraping several boards in one call."""
+
+    boards: List[ScrapeRequest] = Field(..., min_length=1, max_length=BATCH_MAX_BOARDS)
+    max_concurrency: int = Field(
+        default=10, ge=1, le=50, description="Maximum number of board feeds fetched at the same time."
+    )
+    timeout: float = Field(
+        default=REQUEST_TIMEOUT, gt=0, le=120, description="Seconds allowed for each board before it is reported as failed."
+    )
+    deduplicate: bool = Field(default=True, description="Drop pins whose URL was already returned for an earlier board.")
+
+
+@dataclass(slots=True)
 class Pin:
-    """Structured representation of a Pinterest pin."""
+    """Structured representation of a Pinterest pin.
+
+    Slotted so the pin lists held by the feed cache stay compact.
+    """
 
     title: str
     url: str
@@ -50,6 +106,7 @@ class Pin:
     width: Optional[int]
     height: Optional[int]
     keyword: Optional[str]
+    matched_keywords: Tuple[str, ...] = ()
 
     def to_dict(self, idx: int) -> dict:
         return {
@@ -61,10 +118,30 @@ class Pin:
             "width": self.width,
             "height": self.height,
             "keyword": self.keyword,
+            "matched_keywords": list(self.matched_keywords),
         }
 
 
-app = FastAPI(title="Pinterest Scraper API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the pooled upstream client shared by every request."""
+
+    app.state.upstream = UpstreamClient(
+        user_agent=USER_AGENT,
+        timeout=REQUEST_TIMEOUT,
+        max_connections=UPSTREAM_MAX_CONNECTIONS,
+        per_host_limit=UPSTREAM_PER_HOST_LIMIT,
+        rate_limit=UPSTREAM_RATE_LIMIT,
+    )
+    app.state.feed_cache = FeedCache(ttl=FEED_CACHE_TTL, max_bytes=FEED_CACHE_MAX_BYTES)
+    app.state.feed_flights = SingleFlight()
+    try:
+        yield
+    finally:
+        await app.state.upstream.aclose()
+
+
+app = FastAPI(title="Pinterest Scraper API", version="1.0.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -73,6 +150,26 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    """Time every request until its response starts.
+
+    Streamed responses are timed to their first byte; the route template keeps the
+    label set small.
+    """
+
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    REQUEST_SECONDS.Observe(
+        time.perf_counter() - start,
+        request.method,
+        route.path if route is not None else "unmatched",
+        str(response.status_code),
+    )
+    return response
+
+
 def _validate_board_url(board_url: str) -> str:
     parsed = urlparse(board_url)
     if "pinterest." not in parsed.netloc:
@@ -82,85 +179,246 @@ def _validate_board_url(board_url: str) -> str:
     if not path:
         raise HTTPException(status_code=400, detail="The URL must reference a specific Pinterest board.")
 
-    return f"{parsed.scheme}://{parsed.netloc}/{path}.rss"
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}/{path}.rss"
+
 
+def _parse_feed_items(items: Iterable[FeedItem]) -> List[Pin]:
+    """Convert every feed item into a ``Pin`` without applying any filter."""
 
-def _extract_image_from_description(description_html: str) -> tuple[Optional[str], Optional[int], Optional[int]]:
-    if not description_html:
-        return None, None, None
+    return [
+        Pin(
+            title=item.title,
+            url=item.link,
+            image=item.image,
+            description=item.description,
+            width=item.width or None,
+            height=item.height or None,
+            keyword=None,
+        )
+        for item in items
+    ]
 
-    soup = BeautifulSoup(description_html, "html.parser")
-    image = soup.find("img")
-    if not image:
-        return None, None, None
 
-    src = image.get("src")
-    width = image.get("width")
-    height = image.get("height")
+def _keyword_matcher(payload: ScrapeRequest) -> KeywordMatcher:
+    keywords = list(payload.keywords)
+    if payload.keyword:
+        keywords.insert(0, payload.keyword)
+    return get_matcher(tuple(keywords), payload.keyword_mode)
 
+
+def _iter_filtered_pins(pins: Iterable[Pin], payload: ScrapeRequest) -> Iterator[Pin]:
+    """Apply the request filters to parsed pins, tagging the kept ones with the keywords they matched."""
+
+    matcher = _keyword_matcher(payload)
+    min_width = payload.min_width
+    min_height = payload.min_height
+
+    for pin in pins:
+        if min_width and pin.width and pin.width < min_width:
+            continue
+        if min_height and pin.height and pin.height < min_height:
+            continue
+
+        # Title and description are matched as one text, so a phrase may span both.
+        matched = matcher.match(f"{pin.title} {pin.description}")
+        if matched is None:
+            continue
+
+        yield replace(pin, keyword=payload.keyword, matched_keywords=matched)
+
+
+def _filter_pins(pins: Iterable[Pin], payload: ScrapeRequest) -> List[Pin]:
+    return list(_iter_filtered_pins(pins, payload))
+
+
+def _parse_feed(feed: bytes) -> tuple[int, List[Pin]]:
+    with FEED_PARSE_SECONDS.Time():
+        total_items, items = parse_feed([feed])
+        return total_items, _parse_feed_items(items)
+
+
+async def _load_feed(
+    rss_url: str, upstream: UpstreamClient, cache: FeedCache, flights: SingleFlight
+) -> CachedFeed:
+    """Return the parsed feed for ``rss_url``, from the cache when it is still fresh.
+
+    Concurrent misses for the same feed wait on a single upstream fetch.
+    """
+
+    cached, is_fresh = cache.lookup(rss_url)
+    if cached is not None and is_fresh:
+        FEED_LOADS.Inc("cache")
+        return cached
+
+    return await flights.do(rss_url, lambda: _fetch_feed(rss_url, cached, upstream, cache))
+
+
+async def _fetch_feed(
+    rss_url: str, cached: Optional[CachedFeed], upstream: UpstreamClient, cache: FeedCache
+) -> CachedFeed:
+    """Fetch and parse ``rss_url`` and store it in the cache.
+
+    A stale cache entry is revalidated with a conditional request and reused if
+    Pinterest answers 304 Not Modified.
+    """
+
+    headers = cached.validators() if cached is not None else None
     try:
-        width_int = int(width) if width is not None else None
-    except ValueError:
-        width_int = None
-    try:
-        height_int = int(height) if height is not None else None
-    except ValueError:
-        height_int = None
+        with UPSTREAM_FETCH_SECONDS.Time():
+            response = await upstream.get(rss_url, headers=headers)
+    except httpx.HTTPError as exc:
+        FEED_LOADS.Inc("error")
+        raise HTTPException(status_code=502, detail=f"Unable to reach Pinterest: {exc}") from exc
+
+    if response.status_code == 304 and cached is not None:
+        FEED_LOADS.Inc("revalidated")
+        cache.refresh(rss_url)
+        return cached
+
+    if response.status_code != 200:
+        raise HTTPException(status_code=400, detail="Pinterest returned an unexpected response for that board.")
+
+    # Parsing is CPU bound, keep it off the event loop.
+    total_items, pins = await run_in_threadpool(_parse_feed, response.content)
+    feed = CachedFeed(
+        pins=pins,
+        total_items=total_items,
+        size=len(response.content),
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    cache.store(rss_url, feed)
+    FEED_LOADS.Inc("upstream")
+    return feed
+
+
+def _board_summary(payload: ScrapeRequest, rss_url: str, total_items: int, returned_items: int) -> dict:
+    return {
+        "request_url": str(payload.board_url),
+        "rss_url": rss_url,
+        "total_items": total_items,
+        "returned_items": returned_items,
+    }
+
 
-    return src, width_int, height_int
+def _ndjson(record: dict) -> bytes:
+    return dumps(record) + b"\n"
 
 
-def _clean_text(html_fragment: Optional[str]) -> str:
-    if not html_fragment:
-        return ""
-    soup = BeautifulSoup(html_fragment, "html.parser")
-    return soup.get_text(" ", strip=True)
+def _encode_pins(pins: Iterable[Pin], payload: ScrapeRequest, returned: int) -> tuple[bytes, int]:
+    """Filter ``pins`` and encode the kept ones as NDJSON lines, numbering them after ``returned``."""
 
+    lines = []
+    for pin in _iter_filtered_pins(pins, payload):
+        returned += 1
+        lines.append(_ndjson(pin.to_dict(returned)))
+    return b"".join(lines), returned
+
+
+async def _stream_cached_feed(feed: CachedFeed, payload: ScrapeRequest, rss_url: str) -> AsyncIterator[bytes]:
+    lines, returned = _encode_pins(feed.pins, payload, 0)
+    yield lines
+    yield _ndjson({"board": _board_summary(payload, rss_url, feed.total_items, returned)})
+
+
+async def _download_feed(
+    stack: AsyncExitStack,
+    response: httpx.Response,
+    parser: FeedParser,
+    rss_url: str,
+    cache: FeedCache,
+    batches: asyncio.Queue,
+) -> CachedFeed:
+    """Parse the feed while it downloads, putting each batch of parsed pins on ``batches``.
+
+    Runs in its own task, so the feed is stored in the cache and handed to the
+    requests coalesced onto it even if the client that started it goes away.
+    ``None`` is put on ``batches`` once the download is over. Like
+    ``parse_feed``, a malformed document keeps the items parsed before the
+    error, so both endpoints cache and report it the same way.
+    """
 
-def _parse_feed_items(items, keyword: Optional[str], min_width: int, min_height: int) -> List[Pin]:
     pins: List[Pin] = []
-    lowered_keyword = keyword.lower() if keyword else None
-
-    for item in items:
-        title = item.title.get_text(strip=True) if item.title else "Untitled Pin"
-        link = item.link.get_text(strip=True) if item.link else ""
-        description_html = item.description.get_text() if item.description else ""
-        description_text = _clean_text(description_html)
-
-        media = item.find("media:content")
-        if media and media.get("url"):
-            image_url = media.get("url")
-            width = media.get("width")
-            height = media.get("height")
-        else:
-            image_url, width, height = _extract_image_from_description(description_html)
-
-        width_int = int(width) if isinstance(width, str) and width.isdigit() else width or 0
-        height_int = int(height) if isinstance(height, str) and height.isdigit() else height or 0
-
-        if lowered_keyword:
-            haystack = f"{title} {description_text}".lower()
-            if lowered_keyword not in haystack:
-                continue
-
-        if min_width and width_int and width_int < min_width:
-            continue
-        if min_height and height_int and height_int < min_height:
-            continue
+    size = 0
+    try:
+        async with stack:
+            try:
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    batch = _parse_feed_items(parser.feed(chunk))
+                    pins.extend(batch)
+                    batches.put_nowait(batch)
+
+                batch = _parse_feed_items(parser.close())
+                pins.extend(batch)
+                batches.put_nowait(batch)
+            except httpx.HTTPError as exc:
+                FEED_LOADS.Inc("error")
+                raise HTTPException(status_code=502, detail=f"Unable to reach Pinterest: {exc}") from exc
+            except ParseError:
+                pass
+    finally:
+        batches.put_nowait(None)
+
+    feed = CachedFeed(
+        pins=pins,
+        total_items=parser.total_items,
+        size=size,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    cache.store(rss_url, feed)
+    FEED_LOADS.Inc("upstream")
+    return feed
+
+
+def _resolve_flight(flight: asyncio.Future, done: asyncio.Future) -> None:
+    if flight.done():
+        return
+    if done.cancelled():
+        flight.set_exception(HTTPException(status_code=502, detail="The feed download was cancelled."))
+    elif done.exception() is not None:
+        flight.set_exception(done.exception())
+    else:
+        flight.set_result(done.result())
+
+
+async def _stream_upstream_feed(
+    download: asyncio.Future,
+    batches: asyncio.Queue,
+    parser: FeedParser,
+    payload: ScrapeRequest,
+    rss_url: str,
+) -> AsyncIterator[bytes]:
+    """Yield each kept pin as soon as ``_download_feed`` has parsed its item."""
+
+    returned = 0
+    while True:
+        batch = await batches.get()
+        if batch is None:
+            break
+        lines, returned = _encode_pins(batch, payload, returned)
+        if lines:
+            yield lines
+
+    try:
+        await asyncio.shield(download)
+    except HTTPException as exc:
+        yield _ndjson({"error": exc.detail})
+
+    yield _ndjson({"board": _board_summary(payload, rss_url, parser.total_items, returned)})
 
-        pins.append(
-            Pin(
-                title=title,
-                url=link,
-                image=image_url,
-                description=description_text,
-                width=width_int or None,
-                height=height_int or None,
-                keyword=keyword,
-            )
-        )
 
-    return pins
+def get_upstream(request: Request) -> UpstreamClient:
+    return request.app.state.upstream
+
+
+def get_feed_cache(request: Request) -> FeedCache:
+    return request.app.state.feed_cache
+
+
+def get_feed_flights(request: Request) -> SingleFlight:
+    return request.app.state.feed_flights
 
 
 @app.get("/api/health")
@@ -170,40 +428,215 @@ def healthcheck() -> dict:
     return {"status": "ok"}
 
 
-@app.post("/api/scrape")
-def scrape_board(payload: ScrapeRequest) -> dict:
-    """Scrape a public Pinterest board using its RSS feed."""
+@app.get("/api/stats")
+def feed_stats(
+    cache: FeedCache = Depends(get_feed_cache), flights: SingleFlight = Depends(get_feed_flights)
+) -> dict:
+    """Feed cache and request coalescing counters."""
+
+    return {"feed_cache": cache.stats(), "single_flight": flights.stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Request, upstream and parsing timings in the Prometheus text format."""
+
+    return Response(Metrics.Render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+async def _scrape(
+    payload: ScrapeRequest, upstream: UpstreamClient, cache: FeedCache, flights: SingleFlight
+) -> tuple[str, int, List[Pin]]:
+    """Load and filter one board, returning ``(rss_url, total_items, pins)``."""
 
     if not payload.is_public:
         raise HTTPException(status_code=501, detail="Scraping private boards is not supported by the web API.")
 
     rss_url = _validate_board_url(str(payload.board_url))
 
-    headers = {"User-Agent": USER_AGENT}
-    try:
-        response = requests.get(rss_url, headers=headers, timeout=REQUEST_TIMEOUT)
-    except requests.RequestException as exc:
-        raise HTTPException(status_code=502, detail=f"Unable to reach Pinterest: {exc}") from exc
+    feed = await _load_feed(rss_url, upstream, cache, flights)
+    if not feed.total_items:
+        raise HTTPException(status_code=404, detail="No pins were found for the provided board URL.")
 
-    if response.status_code != 200:
-        raise HTTPException(status_code=400, detail="Pinterest returned an unexpected response for that board.")
+    pins = _filter_pins(feed.pins, payload)
+    return rss_url, feed.total_items, pins
 
-    soup = BeautifulSoup(response.text, "xml")
-    items = soup.find_all("item")
-    if not items:
-        raise HTTPException(status_code=404, detail="No pins were found for the provided board URL.")
 
-    pins = _parse_feed_items(items, payload.keyword, payload.min_width, payload.min_height)
+@app.post("/api/scrape", response_class=FastJSONResponse)
+async def scrape_board(
+    payload: ScrapeRequest,
+    upstream: UpstreamClient = Depends(get_upstream),
+    cache: FeedCache = Depends(get_feed_cache),
+    flights: SingleFlight = Depends(get_feed_flights),
+) -> FastJSONResponse:
+    """Scrape a public Pinterest board using its RSS feed."""
 
-    return {
-        "board": {
-            "request_url": str(payload.board_url),
-            "rss_url": rss_url,
-            "total_items": len(items),
-            "returned_items": len(pins),
-        },
-        "pins": [pin.to_dict(idx) for idx, pin in enumerate(pins, start=1)],
-    }
+    rss_url, total_items, pins = await _scrape(payload, upstream, cache, flights)
+
+    return FastJSONResponse(
+        {
+            "board": _board_summary(payload, rss_url, total_items, len(pins)),
+            "pins": [pin.to_dict(idx) for idx, pin in enumerate(pins, start=1)],
+        }
+    )
+
+
+@app.post("/api/scrape/batch", response_class=FastJSONResponse)
+async def scrape_boards(
+    payload: BatchScrapeRequest,
+    upstream: UpstreamClient = Depends(get_upstream),
+    cache: FeedCache = Depends(get_feed_cache),
+    flights: SingleFlight = Depends(get_feed_flights),
+) -> FastJSONResponse:
+    """Scrape several public boards concurrently.
+
+    At most ``max_concurrency`` feeds are fetched at once and each board gets its
+    own ``timeout``, so a slow or failing board is reported in its result entry
+    without holding up the others. Results keep the order of ``boards``; with
+    ``deduplicate`` a pin URL is only returned for the first board it appears in.
+    """
+
+    slots = asyncio.Semaphore(payload.max_concurrency)
+
+    async def scrape_one(board: ScrapeRequest) -> tuple[str, int, List[Pin]]:
+        async with slots:
+            try:
+                return await asyncio.wait_for(_scrape(board, upstream, cache, flights), payload.timeout)
+            except asyncio.TimeoutError as exc:
+                raise HTTPException(status_code=504, detail="Timed out waiting for Pinterest.") from exc
+
+    outcomes = await asyncio.gather(*(scrape_one(board) for board in payload.boards), return_exceptions=True)
+
+    results = []
+    seen_urls: Set[str] = set()
+    returned_items = 0
+    duplicates = 0
+    failed = 0
+    for board, outcome in zip(payload.boards, outcomes):
+        if isinstance(outcome, Exception):
+            if not isinstance(outcome, HTTPException):
+                # An error no scrape step mapped to a status is still only this board's.
+                outcome = HTTPException(status_code=502, detail=f"Unable to scrape this board: {outcome!r}")
+            failed += 1
+            results.append(
+                {
+                    "request_url": str(board.board_url),
+                    "error": {"status_code": outcome.status_code, "detail": outcome.detail},
+                }
+            )
+            continue
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+        rss_url, total_items, pins = outcome
+        if payload.deduplicate:
+            unique = []
+            for pin in pins:
+                if pin.url in seen_urls:
+                    duplicates += 1
+                    continue
+                seen_urls.add(pin.url)
+                unique.append(pin)
+            pins = unique
+
+        returned_items += len(pins)
+        results.append(
+            {
+                "board": _board_summary(board, rss_url, total_items, len(pins)),
+                "pins": [pin.to_dict(idx) for idx, pin in enumerate(pins, start=1)],
+            }
+        )
+
+    return FastJSONResponse(
+        {
+            "summary": {
+                "boards": len(payload.boards),
+                "succeeded": len(payload.boards) - failed,
+                "failed": failed,
+                "returned_items": returned_items,
+                "duplicates_removed": duplicates,
+            },
+            "results": results,
+        }
+    )
+
+
+@app.post("/api/scrape/stream")
+async def scrape_board_stream(
+    payload: ScrapeRequest,
+    upstream: UpstreamClient = Depends(get_upstream),
+    cache: FeedCache = Depends(get_feed_cache),
+    flights: SingleFlight = Depends(get_feed_flights),
+) -> StreamingResponse:
+    """Stream a public board's pins as NDJSON while the feed is parsed.
+
+    Each line is one pin in the same shape as ``POST /api/scrape``; the last line
+    is a ``{"board": {...}}`` summary. A failure after streaming started is
+    reported as an ``{"error": ...}`` line before the summary.
+    """
+
+    if not payload.is_public:
+        raise HTTPException(status_code=501, detail="Scraping private boards is not supported by the web API.")
+
+    rss_url = _validate_board_url(str(payload.board_url))
+
+    cached, is_fresh = cache.lookup(rss_url)
+    flight = None
+    if is_fresh:
+        FEED_LOADS.Inc("cache")
+    else:
+        flight = flights.lead(rss_url)
+        if flight is None:
+            # Another request is already downloading this feed, wait for it and
+            # stream it from the cache. The load is counted there or by the leader.
+            cached = await _load_feed(rss_url, upstream, cache, flights)
+
+    if flight is not None:
+        stack = AsyncExitStack()
+        download = None
+        try:
+            headers = cached.validators() if cached is not None else None
+            try:
+                response = await stack.enter_async_context(upstream.stream(rss_url, headers=headers))
+            except httpx.HTTPError as exc:
+                FEED_LOADS.Inc("error")
+                raise HTTPException(status_code=502, detail=f"Unable to reach Pinterest: {exc}") from exc
+
+            if response.status_code == 304 and cached is not None:
+                await stack.aclose()
+                FEED_LOADS.Inc("revalidated")
+                cache.refresh(rss_url)
+                flight.set_result(cached)
+            elif response.status_code != 200:
+                raise HTTPException(
+                    status_code=400, detail="Pinterest returned an unexpected response for that board."
+                )
+            else:
+                parser = FeedParser()
+                batches: asyncio.Queue = asyncio.Queue()
+                download = asyncio.ensure_future(_download_feed(stack, response, parser, rss_url, cache, batches))
+                download.add_done_callback(lambda done: _resolve_flight(flight, done))
+        except BaseException as exc:
+            # Whatever stopped the request, including the client going away
+            # while the rate limiter held it, the requests waiting on the
+            # flight must not wait forever.
+            if not flight.done():
+                error = exc if isinstance(exc, HTTPException) else None
+                if error is None:
+                    error = HTTPException(status_code=502, detail="The feed download was interrupted.")
+                flight.set_exception(error)
+            if download is None:
+                await stack.aclose()
+            raise
+
+        if download is not None:
+            return StreamingResponse(
+                _stream_upstream_feed(download, batches, parser, payload, rss_url),
+                media_type=NDJSON_MEDIA_TYPE,
+            )
+
+    # An empty board streams just its summary, like it does when it comes from upstream.
+    return StreamingResponse(_stream_cached_feed(cached, payload, rss_url), media_type=NDJSON_MEDIA_TYPE)
 
 
 if __name__ == "__main__":
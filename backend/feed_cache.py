@@ -0,0 +1,109 @@
+"""In-memory cache of parsed board feeds with TTL expiry and LRU eviction."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class CachedFeed:
+    """Parsed pins of one RSS feed plus the validators needed to revalidate it."""
+
+    pins: List[Any]
+    total_items: int
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = field(default=0.0)
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that let Pinterest answer 304."""
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FeedCache:
+    """TTL + LRU cache keyed by the normalized RSS URL.
+
+    Expired entries are kept until they are evicted so they can be revalidated
+    with ``If-None-Match``/``If-Modified-Since`` instead of being refetched.
+    Entries are evicted least recently used first once the summed ``size`` of
+    all entries exceeds ``max_bytes``.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def lookup(self, key: str) -> tuple[Optional[CachedFeed], bool]:
+        """Return ``(entry, is_fresh)`` for ``key``; the entry may be stale or ``None``."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(key)
+        if entry.expires_at > self._clock():
+            self.hits += 1
+            return entry, True
+
+        self.misses += 1
+        return entry, False
+
+    def store(self, key: str, entry: CachedFeed) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous.size
+
+        if entry.size > self.max_bytes:
+            return
+
+        entry.expires_at = self._clock() + self.ttl
+        self._entries[key] = entry
+        self._total_bytes += entry.size
+        while self._total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            self.evictions += 1
+
+    def refresh(self, key: str) -> None:
+        """Extend the lifetime of ``key`` after Pinterest answered 304 Not Modified."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = self._clock() + self.ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
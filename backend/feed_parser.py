@@ -0,0 +1,133 @@
+"""Single-pass parser for Pinterest board RSS feeds."""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+MEDIA_CONTENT_TAG = "{http://search.yahoo.com/mrss/}content"
+
+
+class FeedItem(NamedTuple):
+    """Fields pulled out of one RSS ``<item>``."""
+
+    title: str
+    link: str
+    image: Optional[str]
+    description: str
+    width: Optional[int]
+    height: Optional[int]
+
+
+class _DescriptionParser(HTMLParser):
+    """Collects the visible text and the first ``<img>`` of a description in one pass."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.text: List[str] = []
+        self.image: Optional[dict] = None
+
+    def reset(self) -> None:
+        super().reset()
+        self.text = []
+        self.image = None
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag == "img" and self.image is None:
+            self.image = dict(attrs)
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data) -> None:
+        data = data.strip()
+        if data:
+            self.text.append(data)
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class FeedParser:
+    """Incremental RSS parser that yields items as soon as their ``</item>`` is seen.
+
+    Each item's description HTML is parsed exactly once for both its text and
+    its first image. Parsed elements are cleared right away so memory does not
+    grow with the size of the feed.
+    """
+
+    def __init__(self) -> None:
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._description = _DescriptionParser()
+        self.total_items = 0
+
+    def feed(self, data: bytes) -> List[FeedItem]:
+        """Feed a chunk of the document and return the items it completed."""
+
+        self._parser.feed(data)
+        return list(self._read_events())
+
+    def close(self) -> List[FeedItem]:
+        """Finish parsing and return any remaining items."""
+
+        self._parser.close()
+        return list(self._read_events())
+
+    def _read_events(self) -> Iterator[FeedItem]:
+        for _, element in self._parser.read_events():
+            if element.tag == "item":
+                self.total_items += 1
+                yield self._build_item(element)
+                element.clear()
+
+    def _build_item(self, element: ET.Element) -> FeedItem:
+        title = (element.findtext("title") or "").strip() or "Untitled Pin"
+        link = (element.findtext("link") or "").strip()
+        description_html = element.findtext("description") or ""
+
+        self._description.reset()
+        if description_html:
+            self._description.feed(description_html)
+            self._description.close()
+        description_text = " ".join(self._description.text)
+
+        media = element.find(MEDIA_CONTENT_TAG)
+        if media is not None and media.get("url"):
+            attrs = media.attrib
+        else:
+            attrs = self._description.image or {}
+            attrs = {"url": attrs.get("src"), "width": attrs.get("width"), "height": attrs.get("height")}
+
+        return FeedItem(
+            title=title,
+            link=link,
+            image=attrs.get("url"),
+            description=description_text,
+            width=_to_int(attrs.get("width")),
+            height=_to_int(attrs.get("height")),
+        )
+
+
+def parse_feed(chunks: Iterable[bytes]) -> tuple[int, List[FeedItem]]:
+    """Parse a whole feed and return ``(total_items, items)``.
+
+    A malformed document keeps the items parsed before the error, mirroring the
+    lenient behaviour of the previous HTML-based parser.
+    """
+
+    parser = FeedParser()
+    items: List[FeedItem] = []
+    try:
+        for chunk in chunks:
+            items.extend(parser.feed(chunk))
+        items.extend(parser.close())
+    except ET.ParseError:
+        pass
+    return parser.total_items, items
@@ -0,0 +1,70 @@
+"""Multi-keyword matching compiled once and run in a single pass per text."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Literal, Optional, Tuple
+
+KeywordMode = Literal["any", "all"]
+
+
+class KeywordMatcher:
+    """Case-insensitive matcher for many keywords with any/all semantics.
+
+    All terms are compiled into one regular expression wrapped in a lookahead,
+    so a single scan reports the longest term starting at every position.
+    Shorter terms that are substrings of a found term are credited through a
+    precomputed table, which lets overlapping terms such as ``cat``/``cats`` be
+    reported without rescanning the text.
+
+    Matches are reported with the keyword as it was given. Keywords that only
+    differ in case or surrounding whitespace are one term, reported as the
+    first of them.
+    """
+
+    def __init__(self, keywords: Iterable[str], mode: KeywordMode = "any") -> None:
+        terms: List[str] = []
+        self._keywords: Dict[str, str] = {}
+        for keyword in keywords:
+            term = keyword.strip().lower()
+            if term and term not in self._keywords:
+                terms.append(term)
+                self._keywords[term] = keyword
+
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self.mode = mode
+        self._order = {term: idx for idx, term in enumerate(terms)}
+        self._contained: Dict[str, FrozenSet[str]] = {
+            term: frozenset(other for other in terms if other in term) for term in terms
+        }
+        alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternatives}))", re.IGNORECASE) if terms else None
+
+    def match(self, text: str) -> Optional[Tuple[str, ...]]:
+        """Return the matched keywords in the order given, or ``None`` if the text doesn't pass.
+
+        With no keywords every text passes with an empty tuple.
+        """
+
+        if self._pattern is None:
+            return ()
+
+        found: set = set()
+        for hit in self._pattern.finditer(text):
+            term = hit.group(1).lower()
+            if term not in found:
+                found |= self._contained.get(term, frozenset())
+                if len(found) == len(self.terms):
+                    break
+
+        if not found or (self.mode == "all" and len(found) < len(self.terms)):
+            return None
+        return tuple(self._keywords[term] for term in sorted(found, key=self._order.__getitem__))
+
+
+@lru_cache(maxsize=256)
+def get_matcher(keywords: Tuple[str, ...], mode: KeywordMode = "any") -> KeywordMatcher:
+    """Return a compiled matcher, reusing it across requests with the same keywords."""
+
+    return KeywordMatcher(keywords, mode)
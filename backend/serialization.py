@@ -0,0 +1,34 @@
+"""JSON encoding for API responses, using orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` (plain dicts, lists and scalars) straight to UTF-8 JSON bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that skips FastAPI's ``jsonable_encoder`` pass.
+
+    Endpoints returning this response must hand it JSON-native content; pins are
+    converted with ``Pin.to_dict`` before they get here.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
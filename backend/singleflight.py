@@ -0,0 +1,65 @@
+"""Request coalescing so identical concurrent fetches share one upstream call."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result.
+
+    The call runs in its own task, so a caller that disconnects does not cancel
+    the fetch the other callers are waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._inflight
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()``, or the call already running for ``key`` if there is one."""
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def lead(self, key: str) -> Optional[asyncio.Future]:
+        """Register the caller as the one running the call for ``key``.
+
+        Returns a future that other callers of ``do(key, ...)`` await until the
+        caller resolves it, or ``None`` if a call for ``key`` is already running.
+        The caller must always resolve the future.
+        """
+
+        if key in self._inflight:
+            return None
+        self.calls += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away.
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced, "inflight": self.inflight}
@@ -0,0 +1,102 @@
+"""Shared async HTTP client used to reach Pinterest."""
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Mapping, Optional
+
+import httpx
+
+import RateLimiter
+
+
+class UpstreamClient:
+    """Pooled async HTTP client paced per upstream host.
+
+    One instance is created in the application lifespan and shared by every
+    request, so connections to Pinterest are kept alive between scrapes.
+    Requests wait for their host's ``RateLimiter.HostLimiter``, the same
+    token bucket with adaptive concurrency the scraper uses, and responses
+    asking to slow down (429/503) are retried after their ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        *,
+        user_agent: str,
+        timeout: float,
+        max_connections: int = 200,
+        max_keepalive_connections: int = 50,
+        per_host_limit: int = 20,
+        rate_limit: float = RateLimiter.DEFAULT_RATE,
+        retries: int = 2,
+        backoff: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            headers={"User-Agent": user_agent},
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            follow_redirects=True,
+            transport=transport,
+        )
+        self._limiters = RateLimiter.RateLimiter(
+            rate=rate_limit, burst=max(1, int(rate_limit)), maxConcurrency=per_host_limit
+        )
+        self._retries = retries
+        self._backoff = backoff
+
+    async def get(self, url: str, headers: Optional[Mapping[str, str]] = None) -> httpx.Response:
+        """Fetch ``url`` and read its body."""
+
+        async with self.stream(url, headers=headers) as response:
+            await response.aread()
+            return response
+
+    @asynccontextmanager
+    async def stream(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """Open a streamed GET of ``url`` once its host's limiter allows it.
+
+        The host's slot is given back as soon as the response headers arrive,
+        so slow bodies are not mistaken for a slow host.
+        """
+
+        limiter = self._limiters.Get(url)
+        attempt = 0
+        while True:
+            await limiter.AcquireAsync()
+            started = time.perf_counter()
+            try:
+                request = self._client.build_request("GET", url, headers=headers)
+                response = await self._client.send(request, stream=True)
+            except httpx.TransportError:
+                limiter.Release(failed=True)
+                raise
+            except BaseException:
+                limiter.Release()
+                raise
+
+            throttled = response.status_code in RateLimiter.THROTTLE_STATUSES
+            retry_after = RateLimiter.ParseRetryAfter(response.headers.get("Retry-After"))
+            if throttled and retry_after is None:
+                retry_after = self._backoff * 2**attempt
+            limiter.Release(response.status_code, time.perf_counter() - started, retry_after)
+
+            if not throttled or attempt >= self._retries:
+                break
+            await response.aclose()
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,98 @@
+"""Compare feed parsing throughput of the single-pass parser and the old BeautifulSoup path.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_feed_parser --items 250 --repeat 20
+
+The BeautifulSoup baseline is skipped when ``bs4`` or ``lxml`` is not installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, List
+
+from backend.app import _parse_feed
+
+
+def build_feed(items: int) -> bytes:
+    """Build a synthetic board feed shaped like Pinterest's RSS output."""
+
+    entries = "".join(
+        f"""<item>
+<title>Pin {i}: infographic about topic {i % 37}</title>
+<link>https://www.pinterest.com/pin/{100000 + i}/</link>
+<description><![CDATA[<a href="https://www.pinterest.com/pin/{100000 + i}/"><img src="https://i.pinimg.com/236x/aa/bb/cc/{i:08x}.jpg" width="236" height="{300 + i % 400}"></a>
+Description for pin {i} with <b>some</b> markup &amp; entities.]]></description>
+<pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>
+<guid>https://www.pinterest.com/pin/{100000 + i}/</guid>
+</item>"""
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        f"<title>Synthetic board</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+def _legacy_parse(feed: bytes) -> int:
+    """The per-item BeautifulSoup parsing used before the single-pass parser."""
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(feed.decode("utf-8"), "xml")
+    count = 0
+    for item in soup.find_all("item"):
+        item.title.get_text(strip=True)
+        item.link.get_text(strip=True)
+        description_html = item.description.get_text() if item.description else ""
+        BeautifulSoup(description_html, "html.parser").get_text(" ", strip=True)
+        media = item.find("media:content")
+        if not (media and media.get("url")):
+            image = BeautifulSoup(description_html, "html.parser").find("img")
+            if image:
+                image.get("src"), image.get("width"), image.get("height")
+        count += 1
+    return count
+
+
+def _measure(parse: Callable[[bytes], object], feed: bytes, items: int, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(feed)
+        timings.append(time.perf_counter() - start)
+    return items / min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=250, help="Items in the synthetic feed.")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per parser; the best run is reported.")
+    args = parser.parse_args()
+
+    feed = build_feed(args.items)
+    after = _measure(_parse_feed, feed, args.items, args.repeat)
+
+    try:
+        import bs4  # noqa: F401
+        import lxml  # noqa: F401
+    except ImportError:
+        before = None
+    else:
+        before = _measure(_legacy_parse, feed, args.items, args.repeat)
+
+    print(f"feed: {args.items} items, {len(feed) / 1024:.0f} KiB")
+    if before is None:
+        print("before (BeautifulSoup): skipped, bs4/lxml not installed")
+    else:
+        print(f"before (BeautifulSoup): {before:>10,.0f} items/s")
+    print(f"after  (single pass):   {after:>10,.0f} items/s")
+    if before:
+        print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Run the scraping pipeline end to end against a local Pinterest stand-in.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_offline --pins 1000
+    python -m benchmarks.bench_offline --pins 100000 --only scrape_board,parse_feed_items
+
+No network access is needed: ``benchmarks.standin`` serves the board feed, pin
+images and source pages from localhost. Every stage reports its throughput and
+the p50/p95/p99 latency of a single operation.
+
+Results are compared with ``benchmarks/baseline.json`` (recorded per pin count)
+and the run exits with status 1 if a stage's throughput dropped by more than
+``--tolerance``. Record a new baseline with ``--save-baseline`` after an
+intended change; baselines are machine specific, so record one on the machine
+the comparison runs on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+import CSVHelper
+import ImageFilter
+import RateLimiter
+import TitleParser
+from backend.app import _parse_feed_items, scrape_board, ScrapeRequest
+from backend.feed_cache import FeedCache
+from backend.feed_parser import parse_feed
+from backend.singleflight import SingleFlight
+from backend.upstream import UpstreamClient
+from benchmarks.bench_feed_parser import build_feed
+from benchmarks.standin import StandInServer
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+BOARD_URL = "https://www.pinterest.com/bench/board-{pins}/"
+# Bounds that keep half of the stand-in's image sizes.
+MIN_WIDTH = 400
+MIN_HEIGHT = 400
+PINS_PER_KEYWORD = 100
+
+
+class Result:
+    """Latencies of the operations of one stage and how many items they covered."""
+
+    def __init__(self, name: str, latencies: List[float], items: int, elapsed: float) -> None:
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.items = items
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the latencies, in seconds."""
+
+        if not self.latencies:
+            return 0.0
+        rank = max(0, min(len(self.latencies) - 1, int(round(q * len(self.latencies))) - 1))
+        return self.latencies[rank]
+
+    def to_dict(self) -> dict:
+        return {
+            "throughput": round(self.throughput, 1),
+            "p50": round(self.percentile(0.50), 6),
+            "p95": round(self.percentile(0.95), 6),
+            "p99": round(self.percentile(0.99), 6),
+        }
+
+
+class _StandInTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the stand-in, whichever Pinterest host it names."""
+
+    def __init__(self, base_url: str) -> None:
+        self._base = httpx.URL(base_url)
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme=self._base.scheme, host=self._base.host, port=self._base.port)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def _median_elapsed(latencies: List[float]) -> float:
+    """Time ``latencies`` would take if every run took the median, which keeps
+    one-off stalls out of the throughput of stages with few runs."""
+
+    return statistics.median(latencies) * len(latencies)
+
+
+def _run_threaded(name: str, call: Callable[[str], object], urls: List[str], workers: int) -> Result:
+    """Call ``call`` once per URL on ``workers`` threads, timing every call."""
+
+    def timed(url: str) -> float:
+        start = time.perf_counter()
+        call(url)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latencies = list(executor.map(timed, urls))
+    return Result(name, latencies, len(urls), time.perf_counter() - start)
+
+
+async def _scrape_boards(base_url: str, pins: int, requests: int) -> List[Result]:
+    upstream = UpstreamClient(
+        user_agent="bench", timeout=30, rate_limit=1e6, transport=_StandInTransport(base_url)
+    )
+    payload = ScrapeRequest(board_url=BOARD_URL.format(pins=pins), min_width=200)
+    flights = SingleFlight()
+    results = []
+    try:
+        # Cold: every request misses the cache and fetches and parses the feed.
+        # Warm: every request is served from a cache filled beforehand.
+        for name, fresh_cache in (("scrape_board (cold)", True), ("scrape_board (warm)", False)):
+            cache = FeedCache(ttl=3600, max_bytes=1 << 30)
+            if not fresh_cache:
+                await scrape_board(payload, upstream, cache, flights)
+            latencies = []
+            for _ in range(requests):
+                if fresh_cache:
+                    cache = FeedCache(ttl=3600, max_bytes=1 << 30)
+                start = time.perf_counter()
+                await scrape_board(payload, upstream, cache, flights)
+                latencies.append(time.perf_counter() - start)
+            results.append(Result(name, latencies, requests * pins, _median_elapsed(latencies)))
+    finally:
+        await upstream.aclose()
+    return results
+
+
+def bench_scrape_board(base_url: str, pins: int, args: argparse.Namespace) -> List[Result]:
+    return asyncio.run(_scrape_boards(base_url, pins, args.requests))
+
+
+def bench_parse_feed_items(base_url: str, pins: int, args: argparse.Namespace) -> List[Result]:
+    _, items = parse_feed([build_feed(pins)])
+    latencies = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        _parse_feed_items(items)
+        latencies.append(time.perf_counter() - start)
+    return [Result("_parse_feed_items", latencies, args.requests * pins, _median_elapsed(latencies))]
+
+
+def bench_image_bounds(base_url: str, pins: int, args: argparse.Namespace) -> List[Result]:
+    urls = [f"{base_url}/img/{i}.jpg" for i in range(pins)]
+    return [
+        _run_threaded(
+            "IsImageGreaterThanBounds",
+            lambda url: ImageFilter.IsImageGreaterThanBounds(url, MIN_WIDTH, MIN_HEIGHT),
+            urls,
+            args.workers,
+        )
+    ]
+
+
+def bench_get_title(base_url: str, pins: int, args: argparse.Namespace) -> List[Result]:
+    urls = [f"{base_url}/article/{i}" for i in range(pins)]
+    return [_run_threaded("GetTitle", TitleParser.GetTitle, urls, args.workers)]
+
+
+def _write_keyword_csvs(root: str, pins: int) -> None:
+    for start in range(0, pins, PINS_PER_KEYWORD):
+        keyword = f"keyword{start // PINS_PER_KEYWORD:05d}"
+        os.mkdir(os.path.join(root, keyword))
+        with open(os.path.join(root, keyword, f"{keyword}.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSVHelper.CSV_HEADER)
+            for i in range(start, min(start + PINS_PER_KEYWORD, pins)):
+                writer.writerow([f"{i:08x}.jpg", keyword, f"Pin {i}: caption", f"https://www.pinterest.com/pin/{i}/"])
+
+
+def bench_master_csv(base_url: str, pins: int, args: argparse.Namespace) -> List[Result]:
+    root = tempfile.mkdtemp(prefix="bench-csv-")
+    try:
+        _write_keyword_csvs(root, pins)
+        results = []
+        # Full: every run rebuilds the master CSV. Rerun: nothing changed since
+        # the last run, so only the manifest is checked.
+        for name, rebuild in (("CreateMasterCSV (full)", True), ("CreateMasterCSV (rerun)", False)):
+            latencies = []
+            for _ in range(args.requests):
+                if rebuild and CSVHelper.DoesCSVExist(root, "master.csv"):
+                    CSVHelper.RemoveCSV(root, "master.csv")
+                start = time.perf_counter()
+                CSVHelper.CreateMasterCSV(root, "master.csv")
+                latencies.append(time.perf_counter() - start)
+            results.append(Result(name, latencies, args.requests * pins, _median_elapsed(latencies)))
+        return results
+    finally:
+        shutil.rmtree(root)
+
+
+BENCHMARKS: Dict[str, Callable[[str, int, argparse.Namespace], List[Result]]] = {
+    "scrape_board": bench_scrape_board,
+    "parse_feed_items": bench_parse_feed_items,
+    "image_bounds": bench_image_bounds,
+    "get_title": bench_get_title,
+    "master_csv": bench_master_csv,
+}
+
+
+def _load_baseline() -> dict:
+    try:
+        return json.loads(BASELINE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _report(results: Iterable[Result], baseline: Optional[dict], tolerance: float) -> List[str]:
+    """Print one line per result and return the names of the ones that regressed."""
+
+    regressions = []
+    print(f"{'stage':<26} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}   vs baseline")
+    for result in results:
+        line = (
+            f"{result.name:<26} {result.throughput:>12,.0f} {result.percentile(0.50) * 1000:>9.2f}"
+            f" {result.percentile(0.95) * 1000:>9.2f} {result.percentile(0.99) * 1000:>9.2f}"
+        )
+        previous = (baseline or {}).get(result.name)
+        if previous and previous["throughput"]:
+            change = result.throughput / previous["throughput"] - 1
+            line += f"   {change:+.0%}"
+            if change < -tolerance:
+                line += "  REGRESSION"
+                regressions.append(result.name)
+        print(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=1000, help="Pins on the synthetic board (100 to 100000).")
+    parser.add_argument("--requests", type=int, default=10, help="Repetitions of the stages that run per board.")
+    parser.add_argument("--workers", type=int, default=8, help="Threads issuing image and title requests.")
+    parser.add_argument("--only", default=",".join(BENCHMARKS), help="Comma separated stages to run.")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed throughput drop before failing.")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Record the results in {BASELINE_PATH.name}.")
+    args = parser.parse_args()
+
+    if not 100 <= args.pins <= 100000:
+        parser.error("--pins must be between 100 and 100000")
+    names = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    # The stand-in never throttles; pace it only as much as the workers can
+    # load it, so the stages measure the clients rather than the rate limit.
+    RateLimiter.Configure(rate=1e6, burst=1000000, maxConcurrency=args.workers)
+
+    results: List[Result] = []
+    with StandInServer() as server:
+        for name in names:
+            results.extend(BENCHMARKS[name](server.base_url, args.pins, args))
+
+    baselines = _load_baseline()
+    key = str(args.pins)
+    print(f"pins: {args.pins}, requests: {args.requests}, workers: {args.workers}")
+    regressions = _report(results, None if args.save_baseline else baselines.get(key), args.tolerance)
+
+    if args.save_baseline:
+        baselines.setdefault(key, {}).update({result.name: result.to_dict() for result in results})
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {BASELINE_PATH}")
+    elif regressions:
+        print(f"throughput regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure pin memory use and response serialization for a large board.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_pin_serialization --pins 10000
+
+"Before" rebuilds the previous setup: a regular ``@dataclass`` pin serialized
+through ``jsonable_encoder`` and ``json.dumps`` the way FastAPI encodes a returned
+dict. "After" is the slotted ``Pin`` encoded by ``FastJSONResponse``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.app import Pin
+from backend.serialization import FastJSONResponse, orjson
+
+
+@dataclass
+class LegacyPin:
+    title: str
+    url: str
+    image: Optional[str]
+    description: str
+    width: Optional[int]
+    height: Optional[int]
+    keyword: Optional[str]
+
+    to_dict = Pin.to_dict
+
+
+def _make_pins(cls, count: int) -> list:
+    return [
+        cls(
+            title=f"Pin {i}: infographic about topic {i % 37}",
+            url=f"https://www.pinterest.com/pin/{100000 + i}/",
+            image=f"https://i.pinimg.com/236x/aa/bb/cc/{i:08x}.jpg",
+            description=f"Description for pin {i} with some text.",
+            width=236,
+            height=300 + i % 400,
+            keyword="infographic",
+        )
+        for i in range(count)
+    ]
+
+
+def _pins_memory(cls, count: int) -> int:
+    tracemalloc.start()
+    pins = _make_pins(cls, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del pins
+    return size
+
+
+def _body(pins: list) -> dict:
+    return {
+        "board": {"request_url": "", "rss_url": "", "total_items": len(pins), "returned_items": len(pins)},
+        "pins": [pin.to_dict(idx) for idx, pin in enumerate(pins, start=1)],
+    }
+
+
+def _legacy_render(pins: list) -> bytes:
+    content = jsonable_encoder(_body(pins))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _fast_render(pins: list) -> bytes:
+    return FastJSONResponse(_body(pins)).body
+
+
+def _best_of(render: Callable[[list], bytes], pins: list, repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(pins)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=10000, help="Number of pins in the response.")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per encoder; the best run is reported.")
+    args = parser.parse_args()
+
+    legacy_memory = _pins_memory(LegacyPin, args.pins)
+    slotted_memory = _pins_memory(Pin, args.pins)
+
+    legacy_pins = _make_pins(LegacyPin, args.pins)
+    pins = _make_pins(Pin, args.pins)
+    assert json.loads(_legacy_render(legacy_pins)) == json.loads(_fast_render(pins))
+
+    before = _best_of(_legacy_render, legacy_pins, args.repeat)
+    after = _best_of(_fast_render, pins, args.repeat)
+
+    encoder = "orjson" if orjson is not None else "json (orjson not installed)"
+    print(f"pins: {args.pins}, encoder: {encoder}")
+    print(f"memory  before: {legacy_memory / 1024:>9,.0f} KiB   after: {slotted_memory / 1024:>9,.0f} KiB")
+    print(f"encode  before: {before * 1000:>9,.1f} ms    after: {after * 1000:>9,.1f} ms   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Local HTTP stand-in for the parts of Pinterest the scrapers talk to.
+
+Serves, from memory and without touching the network:
+
+* ``/<user>/board-<pins>.rss`` -- a synthetic board feed with ``<pins>`` items
+* ``/img/<id>.jpg`` -- JPEG images whose size depends on ``<id>``
+* ``/article/<id>`` -- source pages with a ``<title>`` followed by a large body
+
+Responses are generated once per distinct URL shape and cached, so the server
+measures the clients rather than itself.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import sys
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from benchmarks.bench_feed_parser import build_feed
+
+FEED_PATTERN = re.compile(r"^/[^/]+/board-(\d+)\.rss$")
+IMAGE_PATTERN = re.compile(r"^/img/(\d+)\.jpg$")
+ARTICLE_PATTERN = re.compile(r"^/article/(\d+)$")
+
+# Image sizes cycled through by id, so bound checks both keep and reject images.
+IMAGE_SIZES = ((236, 300), (474, 600), (736, 1100), (300, 200))
+ARTICLE_BODY_BYTES = 200 * 1024
+
+
+def image_size(image_id: int) -> Tuple[int, int]:
+    return IMAGE_SIZES[image_id % len(IMAGE_SIZES)]
+
+
+@lru_cache(maxsize=None)
+def _feed(pins: int) -> bytes:
+    return build_feed(pins)
+
+
+@lru_cache(maxsize=None)
+def _image(width: int, height: int) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (width % 256, height % 256, 128)).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _article_body() -> bytes:
+    return b"<p>" + b"lorem ipsum " * (ARTICLE_BODY_BYTES // 12) + b"</p></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        path = self.path.split("?", 1)[0]
+        match = FEED_PATTERN.match(path)
+        if match:
+            return self._send(_feed(int(match.group(1))), "application/rss+xml; charset=utf-8")
+
+        match = IMAGE_PATTERN.match(path)
+        if match:
+            return self._send(_image(*image_size(int(match.group(1)))), "image/jpeg")
+
+        match = ARTICLE_PATTERN.match(path)
+        if match:
+            head = f"<html><head><meta charset=\"utf-8\"><title>Article {match.group(1)}</title></head><body>"
+            return self._send(head.encode("utf-8") + _article_body(), "text/html; charset=utf-8")
+
+        self._send(b"not found", "text/plain", status=404)
+
+    def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # Clients that stop reading early (image probes, title parsing)
+            # close the connection mid-body.
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # Closed keep-alive connections are routine here, not worth a traceback.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    """Runs the stand-in on a free localhost port in a background thread.
+
+    Use as a context manager; ``base_url`` is valid inside the ``with`` block.
+    """
+
+    def __init__(self) -> None:
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -17,6 +17,20 @@
 #   May 16, 2020:
 #       1). RunScraper updated so user only has to enter keyword instead of having
 #           to enter keyword and directory (this is usually the same)
+#   October 18, 2026:
+#       1). RunScraper updated so user can set the number of download workers
+#       2). RunScraper updated so user can export metadata.jsonl to the legacy
+#           metadata.json layout
+#       3). Master CSV is built with one process per CPU
+#       4). RunScraper updated so user can resume an interrupted scrape
+#       5). RunScraper updated so user can set how close two images must be to
+#           be stored once
+#       6). RunScraper updated so user can set the number of browsers that
+#           scrape pin pages
+#       7). RunScraper updated so user can set how many megabytes image
+#           downloads may have in flight
+#       8). PrintCommandList() lists the export and worker, duplicate and
+#           budget settings commands
 
 # TODO 
 #   1. Updated scraper so the user can enter root directory from shell
@@ -68,13 +82,21 @@ def RunScraper():
             linkSetURL = input('What pinterest page do you wanna scrape? ')
             pinObj.GetLinkSet(linkSetURL, keyword)
             pinObj.ScrapeLinkset()
+        elif (tokens[0] == 'resume'):
+            keyword = input('Keyword: ')
+            if (pinObj.Resume(keyword)):
+                pinObj.ScrapeLinkset()
+        elif (tokens[0] == 'export'):
+            if (len(tokens) == 2 and tokens[1] == 'metadata'):
+                keyword = input('Keyword: ')
+                pinObj.ExportMetadata(keyword)
         elif (tokens[0] == 'help'):
             PrintCommandList()
         elif (tokens[0] == 'create'):
             if (len(tokens) == 3):
                 if (tokens[1] == 'master' and tokens[2] == 'csv'):
                     print('root:%s'%pinObj.GetRoot())
-                    CSVHelper.CreateMasterCSV(pinObj.GetRoot(), 'master.csv')
+                    CSVHelper.CreateMasterCSV(pinObj.GetRoot(), 'master.csv', os.cpu_count() or 1)
         elif (tokens[0] == 'set'):
             if (len(tokens) == 3):
                 if (tokens[1] == 'root' and tokens[2] == 'directory'):
@@ -86,11 +108,52 @@ def RunScraper():
                     vMin = input('vertical min: ')
                     if (not pinObj.SetBounds(hMin, vMin)):
                         print('Invalid bounds. Bounds could not be set!\n')
+            elif (len(tokens) == 4):
+                if (tokens[1] == 'download' and tokens[2] == 'workers'):
+                    try:
+                        workers = int(tokens[3])
+                    except ValueError:
+                        workers = 0
+                    if (not pinObj.SetDownloadWorkers(workers)):
+                        print('Invalid worker count. Workers could not be set!\n')
+                elif (tokens[1] == 'scrape' and tokens[2] == 'workers'):
+                    try:
+                        workers = int(tokens[3])
+                    except ValueError:
+                        workers = 0
+                    if (not pinObj.SetScrapeWorkers(workers)):
+                        print('Invalid worker count. Workers could not be set!\n')
+                elif (tokens[1] == 'duplicate' and tokens[2] == 'distance'):
+                    if (tokens[3] == 'off'):
+                        distance = None
+                    else:
+                        try:
+                            distance = int(tokens[3])
+                        except ValueError:
+                            distance = -1
+                    if (not pinObj.SetDuplicateDistance(distance)):
+                        print('Invalid distance. Distance could not be set!\n')
+                elif (tokens[1] == 'download' and tokens[2] == 'budget'):
+                    if (tokens[3] == 'off'):
+                        maxBytes = None
+                    else:
+                        try:
+                            maxBytes = int(float(tokens[3]) * 1024 * 1024)
+                        except ValueError:
+                            maxBytes = 0
+                    if (not pinObj.SetMaxBytesInFlight(maxBytes)):
+                        print('Invalid budget. Budget could not be set!\n')
 
 
 # desc: Prints out the currently supported commands 
 def PrintCommandList():
-    print('\nCommands:\nscrape - runs Pinterest Scraper\nquit - Terminates program')
+    print('\nCommands:\nscrape - runs Pinterest Scraper\nresume - continues an interrupted scrape\n'
+          'export metadata - writes metadata.jsonl out in the legacy metadata.json layout\n'
+          'set download workers <n> - sets how many images are downloaded at once\n'
+          'set scrape workers <n> - sets how many browsers scrape pin pages at once\n'
+          'set duplicate distance <bits|off> - sets how close two images must be to be stored once\n'
+          'set download budget <MiB|off> - sets how many megabytes downloads may have in flight\n'
+          'quit - Terminates program')
     print('\n')
 
 # desc: Receives and returns the user's password
@@ -44,7 +44,7 @@ const ScrapingForm = ({
     setScrapingResults([]);
 
     try {
-      const response = await fetch('/api/scrape', {
+      const response = await fetch('/api/scrape/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
@@ -60,16 +60,70 @@ const ScrapingForm = ({
         })
       });
 
-      const data = await response.json();
-
       if (!response.ok) {
+        const data = await response.json();
         setError(data.detail || 'An unexpected error occurred while scraping the board.');
         return;
       }
 
-      setScrapingResults(data.pins || []);
-      setError(null);
-      onScrapeComplete();
+      // The stream is NDJSON: one pin per line, then a {"board": ...} summary.
+      // Pins are shown as they arrive instead of after the whole board is parsed.
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      let hasShownResults = false;
+      let streamError = null;
+      let summary = null;
+
+      const handleLines = (lines) => {
+        const pins = [];
+        lines.forEach((line) => {
+          if (!line.trim()) {
+            return;
+          }
+          const record = JSON.parse(line);
+          if (record.error) {
+            streamError = record.error;
+            setError(record.error);
+          } else if (record.board) {
+            summary = record.board;
+          } else {
+            pins.push(record);
+          }
+        });
+        if (pins.length) {
+          setScrapingResults((previous) => [...previous, ...pins]);
+          if (!hasShownResults && !streamError) {
+            hasShownResults = true;
+            onScrapeComplete();
+          }
+        }
+      };
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+          break;
+        }
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        handleLines(lines);
+      }
+      handleLines([buffered]);
+
+      // An error line means the board was not read to the end, so the scrape
+      // failed even though the response started out fine.
+      if (streamError) {
+        return;
+      }
+      if (summary && !summary.total_items) {
+        setError('No pins were found for the provided board URL.');
+        return;
+      }
+      if (!hasShownResults) {
+        onScrapeComplete();
+      }
     } catch (err) {
       setError('Unable to reach the scraping service. Please ensure the backend is running.');
     } finally {